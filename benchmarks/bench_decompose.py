@@ -0,0 +1,64 @@
+"""
+Benchmark of scheduling the independent components of a model in parallel against scheduling it directly.
+
+For each multi-node algorithm, times scheduling a generated model of independent pipelines directly and with
+`decompose.schedule_components` on a pool of worker processes, and reports the makespan of both schedules.
+Parallel scheduling changes the schedules, so only enable it with COMPONENT_WORKERS where this shows a
+speed-up on the deployment machine, at a makespan that is acceptable. Only the standard library is used.
+
+Usage:
+    python3 benchmarks/bench_decompose.py --tasks 20000 --nodes 16 --workers 4 --repeat 3
+"""
+
+__version__ = "1.0.0"
+
+
+import argparse
+import os
+
+from bench_utils import best_time, discard_output
+from model_generator import generate_model
+
+
+def makespan(result):
+    """Return the time the last task of a schedule ends."""
+    return max((entry["end_time"] for entry in result["schedule"]), default=0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=20000, help="number of tasks of the model")
+    parser.add_argument("--nodes", type=int, default=16, help="number of compute nodes")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="number of worker processes")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per algorithm and path, the fastest is used")
+    args = parser.parse_args()
+
+    # The pool is sized from the configuration when it is first used
+    os.environ["COMPONENT_WORKERS"] = str(args.workers)
+    import algorithms as alg
+    from decompose import schedule_components
+
+    model = generate_model(args.tasks, args.nodes)
+    # Deadlines loose enough that no algorithm drops tasks, as the least laxity algorithm would then fail
+    for task in model["application"]["tasks"]:
+        task["deadline"] *= 100
+    application_data, platform_data = model["application"], model["platform"]
+    # Start the worker processes before timing
+    with discard_output():
+        schedule_components(alg.ldf_multinode, application_data, platform_data, parallel=True)
+
+    print(f"{args.tasks} tasks, {args.nodes} compute nodes, {args.workers} workers, {os.cpu_count()} CPUs")
+    print(f"{'algorithm':>16} {'direct ms':>10} {'parallel ms':>12} {'direct makespan':>16} {'parallel makespan':>18}")
+    for algorithm in (alg.ll_multinode, alg.ldf_multinode, alg.edf_multinode):
+        with discard_output():
+            direct = algorithm(application_data, platform_data)
+            parallel = schedule_components(algorithm, application_data, platform_data, parallel=True)
+        direct_ms = best_time(lambda: algorithm(application_data, platform_data), args.repeat)
+        parallel_ms = best_time(
+            lambda: schedule_components(algorithm, application_data, platform_data, parallel=True), args.repeat
+        )
+        print(f"{direct['name']:>16} {direct_ms:>10.1f} {parallel_ms:>12.1f} {makespan(direct):>16} {makespan(parallel):>18}")
+
+
+if __name__ == "__main__":
+    main()
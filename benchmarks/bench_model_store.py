@@ -0,0 +1,64 @@
+"""
+Benchmark of scheduling a stored model by id against scheduling the same model sent as JSON.
+
+For each model size, times reading the model and running every scheduling algorithm on it, either by parsing the
+JSON body as /schedule_jobs does or by mapping the stored model as a request with a 'model_id' does. Reusing a
+stored model should never be slower than sending it again. Only the standard library is used.
+
+Usage:
+    python3 benchmarks/bench_model_store.py --tasks 1000 20000 --repeat 5
+"""
+
+__version__ = "1.0.0"
+
+
+import argparse
+import json
+import tempfile
+
+from bench_utils import best_time
+from model_generator import generate_model
+
+
+def schedule_all(application_data, platform_data):
+    """Run every scheduling algorithm on a model, as /schedule_jobs does without decomposing it."""
+    import algorithms as alg
+
+    for algorithm in (alg.ldf_single_node, alg.edf_single_node):
+        algorithm(application_data)
+    for algorithm in (alg.ll_multinode, alg.ldf_multinode, alg.edf_multinode):
+        algorithm(application_data, platform_data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1000, 20000], help="numbers of tasks of the models")
+    parser.add_argument("--nodes", type=int, default=16, help="number of compute nodes")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per model and path, the fastest is used")
+    args = parser.parse_args()
+
+    from model_store import ModelStore
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ModelStore(directory, 1 << 40)
+        print(f"{'tasks':>7} {'json ms':>10} {'stored ms':>10}")
+        for num_tasks in args.tasks:
+            # Deadlines loose enough that no algorithm drops tasks, as the least laxity algorithm would then fail
+            model = generate_model(num_tasks, args.nodes)
+            for task in model["application"]["tasks"]:
+                task["deadline"] *= 100
+            body = json.dumps(model)
+            model_id = store.put(model)
+
+            def from_json():
+                data = json.loads(body)
+                schedule_all(data["application"], data["platform"])
+
+            def from_store():
+                schedule_all(*store.get(model_id).model())
+
+            print(f"{num_tasks:>7} {best_time(from_json, args.repeat):>10.1f} {best_time(from_store, args.repeat):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
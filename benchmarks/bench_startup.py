@@ -0,0 +1,94 @@
+"""
+Start-up benchmark for the scheduling backend.
+
+Measures, each in a fresh Python interpreter so nothing is cached between runs:
+
+- import: the time taken by `import backend`.
+- first request: the time from starting the interpreter to the first `/schedule_jobs` response,
+  served in-process through the ASGI app so no network or server start-up is included.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 10] [--model tests/input_models/example1.json]
+"""
+
+__version__ = "1.0.0"
+
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+
+repo_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+src_dir = os.path.join(repo_dir, "src")
+default_model = os.path.join(repo_dir, "tests", "input_models", "example1.json")
+
+# Runs in the child interpreter. The first request is sent through the app with a raw ASGI call,
+# so the measurement does not depend on an HTTP client being installed.
+CHILD_SCRIPT = """
+import time
+t0 = time.perf_counter()
+import asyncio, json, sys
+sys.path.insert(0, {src_dir!r})
+import backend
+t_import = time.perf_counter() - t0
+
+with open({model!r}) as f:
+    body = f.read().encode()
+
+async def first_request():
+    messages = [{{"type": "http.request", "body": body, "more_body": False}}]
+    sent = []
+    async def receive():
+        return messages.pop(0) if messages else {{"type": "http.disconnect"}}
+    async def send(message):
+        sent.append(message)
+    scope = {{
+        "type": "http", "asgi": {{"version": "3.0"}}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": "/schedule_jobs", "raw_path": b"/schedule_jobs", "query_string": b"",
+        "root_path": "", "headers": [(b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 0), "server": ("127.0.0.1", 8000),
+    }}
+    await backend.app(scope, receive, send)
+    return sent[0]["status"]
+
+status = asyncio.run(first_request())
+t_first = time.perf_counter() - t0
+print(json.dumps({{"import": t_import, "first_request": t_first, "status": status, "networkx_loaded": "networkx" in sys.modules}}))
+"""
+
+
+def run_once(model):
+    script = CHILD_SCRIPT.format(src_dir=src_dir, model=model)
+    output = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True
+    ).stdout
+    # The backend prints request and response data, the measurement is the last line
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="number of fresh interpreters to measure")
+    parser.add_argument("--model", default=default_model, help="JSON model sent as the first request")
+    args = parser.parse_args()
+
+    results = [run_once(os.path.abspath(args.model)) for _ in range(args.runs)]
+
+    if any(result["status"] != 200 for result in results):
+        sys.exit("First request did not succeed: {}".format([result["status"] for result in results]))
+
+    for key, label in (("import", "import backend"), ("first_request", "time to first request")):
+        samples = [result[key] * 1000 for result in results]
+        print(
+            f"{label:<24} median {statistics.median(samples):8.1f} ms"
+            f"   min {min(samples):8.1f} ms   max {max(samples):8.1f} ms"
+        )
+    print(f"networkx loaded: {any(result['networkx_loaded'] for result in results)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Helpers shared by the benchmarks.
+
+The benchmarks import the modules of the app from src/ and generate their models with the model generator of the
+tests, so importing this module puts both directories on the import path.
+
+Functions:
+- discard_output: Context manager discarding the standard output of the process and of its worker processes.
+- best_time: Shortest time of repeated calls of a function, with their output discarded.
+"""
+
+__version__ = "1.0.0"
+
+
+import contextlib
+import os
+import sys
+import time
+
+
+repo_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(repo_dir, "src"))
+sys.path.append(os.path.join(repo_dir, "tests"))
+
+
+@contextlib.contextmanager
+def discard_output():
+    """Discard the standard output of the process, and of the worker processes it starts, at the file descriptor level."""
+    sys.stdout.flush()
+    saved = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved, 1)
+        os.close(saved)
+        os.close(devnull)
+
+
+def best_time(function, repeat):
+    """Return the shortest time in milliseconds of repeat calls of a function, with its log output discarded."""
+    best = float("inf")
+    for _ in range(repeat):
+        with discard_output():
+            start = time.perf_counter()
+            function()
+            best = min(best, time.perf_counter() - start)
+    return best * 1000
@@ -0,0 +1,111 @@
+"""
+Calibration of the cost model used by the admission control of `/schedule_jobs`.
+
+Generates models of a range of sizes, times the work a `/schedule_jobs` request does for each of them, without
+and with insertion (validation, all scheduling algorithms and output validation, as in
+`backend.compute_schedules`), and fits
+the coefficients of the linear cost model to the timings by least squares. Coefficients that would come out
+negative are left out of the fit and set to 0, so the estimate never decreases when a model grows.
+
+Run it on the deployment machine and set the printed environment variables for the server. Only the standard
+library is used.
+
+Usage:
+    python3 benchmarks/calibrate_cost_model.py --repeat 3
+"""
+
+__version__ = "1.0.0"
+
+
+import argparse
+
+from bench_utils import best_time
+from model_generator import generate_model
+from admission import INSERTION_TASK_CORES, model_counts
+
+# Sizes (tasks, messages per task, compute nodes, extra links) of the generated models
+default_sizes = [
+    (tasks, messages_per_task, nodes, extra_links)
+    for tasks in (50, 500, 2000, 8000)
+    for messages_per_task, nodes, extra_links in ((0, 2, 0), (1, 8, 8), (2, 32, 0), (2, 4, 64))
+]
+
+
+def least_squares(rows, targets):
+    """Solve the normal equations of a small least squares problem by Gaussian elimination."""
+    size = len(rows[0])
+    matrix = [[sum(row[i] * row[j] for row in rows) for j in range(size)] for i in range(size)]
+    vector = [sum(row[i] * target for row, target in zip(rows, targets)) for i in range(size)]
+    for column in range(size):
+        pivot = max(range(column, size), key=lambda r: abs(matrix[r][column]))
+        matrix[column], matrix[pivot] = matrix[pivot], matrix[column]
+        vector[column], vector[pivot] = vector[pivot], vector[column]
+        for r in range(column + 1, size):
+            factor = matrix[r][column] / matrix[column][column]
+            for c in range(column, size):
+                matrix[r][c] -= factor * matrix[column][c]
+            vector[r] -= factor * vector[column]
+    solution = [0.0] * size
+    for r in reversed(range(size)):
+        solution[r] = (vector[r] - sum(matrix[r][c] * solution[c] for c in range(r + 1, size))) / matrix[r][r]
+    return solution
+
+
+def fit(samples):
+    """
+    Fit the cost model to (counts, milliseconds) samples.
+
+    Returns:
+        list: The base and the coefficients per task, message, node, link and task times core with insertion, none
+              of them negative.
+    """
+    names = ("tasks", "messages", "nodes", "links", INSERTION_TASK_CORES)
+    features = list(range(len(names) + 1))
+    rows = [[1.0] + [counts[name] for name in names] for counts, _ in samples]
+    while True:
+        solution = least_squares([[row[i] for i in features] for row in rows], [cost for _, cost in samples])
+        coefficients = [0.0] * (len(names) + 1)
+        for feature, value in zip(features, solution):
+            coefficients[feature] = value
+        negative = [feature for feature in features if coefficients[feature] < 0]
+        if not negative:
+            return coefficients
+        features.remove(min(negative, key=lambda feature: coefficients[feature]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per model, the fastest is used")
+    parser.add_argument("--scale", type=float, default=1.0, help="factor applied to the number of tasks of every model")
+    args = parser.parse_args()
+
+    from backend import compute_schedules
+
+    samples = []
+    print(f"{'tasks':>7} {'messages':>9} {'nodes':>6} {'links':>6} {'insertion':>10} {'ms':>10}")
+    for num_tasks, messages_per_task, num_compute_nodes, extra_links in default_sizes:
+        model = generate_model(
+            max(2, int(num_tasks * args.scale)), num_compute_nodes, messages_per_task, extra_links=extra_links
+        )
+        for insertion in (False, True):
+            request = dict(model, insertion=insertion)
+            counts = model_counts(model["application"], model["platform"], insertion)
+            cost = best_time(lambda: compute_schedules(request), args.repeat)
+            samples.append((counts, cost))
+            print(
+                f"{counts['tasks']:>7} {counts['messages']:>9} {counts['nodes']:>6} {counts['links']:>6} "
+                f"{str(insertion):>10} {cost:>10.2f}"
+            )
+
+    base, per_task, per_message, per_node, per_link, per_insertion_task_core = fit(samples)
+    print()
+    print(f"COST_MODEL_BASE={base:.4g}")
+    print(f"COST_MODEL_PER_TASK={per_task:.4g}")
+    print(f"COST_MODEL_PER_MESSAGE={per_message:.4g}")
+    print(f"COST_MODEL_PER_NODE={per_node:.4g}")
+    print(f"COST_MODEL_PER_LINK={per_link:.4g}")
+    print(f"COST_MODEL_PER_INSERTION_TASK_CORE={per_insertion_task_core:.4g}")
+
+
+if __name__ == "__main__":
+    main()
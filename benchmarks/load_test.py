@@ -0,0 +1,118 @@
+"""
+Load test for a running scheduling backend.
+
+Sends the same model to `/schedule_jobs` from a number of concurrent clients for a fixed duration and reports the
+throughput and latency percentiles. Each client holds one keep-alive connection, so the numbers include the
+server's connection handling but not repeated TCP handshakes. Only the standard library is used.
+
+Usage:
+    SERVER_WORKERS=8 python3 src/server.py &
+    python3 benchmarks/load_test.py --url http://127.0.0.1:8000/schedule_jobs --concurrency 64 --duration 30
+"""
+
+__version__ = "1.0.0"
+
+
+import argparse
+import http.client
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+repo_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+default_model = os.path.join(repo_dir, "tests", "input_models", "example1.json")
+
+
+def percentile(sorted_samples, fraction):
+    """Return the sample at the given fraction (0 to 1) of an already sorted list, by nearest rank."""
+    if not sorted_samples:
+        return float("nan")
+    index = min(len(sorted_samples) - 1, max(0, round(fraction * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+def client(url, body, deadline, latencies, errors, lock):
+    """Send requests over one keep-alive connection until the deadline, recording latencies in seconds."""
+    parts = urlsplit(url)
+    connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+    path = parts.path or "/"
+    headers = {"Content-Type": "application/json"}
+    connection = connection_class(parts.netloc, timeout=60)
+    local_latencies = []
+    local_errors = {}
+
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            connection.request("POST", path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException) as err:
+            status = type(err).__name__
+            # Reconnect, the server may have closed the connection (e.g. a worker restart)
+            connection.close()
+            connection = connection_class(parts.netloc, timeout=60)
+        if status == 200:
+            local_latencies.append(time.perf_counter() - start)
+        else:
+            local_errors[status] = local_errors.get(status, 0) + 1
+
+    connection.close()
+    with lock:
+        latencies.extend(local_latencies)
+        for status, count in local_errors.items():
+            errors[status] = errors.get(status, 0) + count
+
+
+def run(url, body, concurrency, duration):
+    """
+    Run the load test.
+
+    Returns:
+        tuple: The sorted successful request latencies in seconds, a dict of error counts by status, and the elapsed time.
+    """
+    latencies = []
+    errors = {}
+    lock = threading.Lock()
+    start = time.perf_counter()
+    deadline = start + duration
+    threads = [
+        threading.Thread(target=client, args=(url, body, deadline, latencies, errors, lock))
+        for _ in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sorted(latencies), errors, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000/schedule_jobs", help="endpoint to load")
+    parser.add_argument("--model", default=default_model, help="JSON model sent with every request")
+    parser.add_argument("--concurrency", type=int, default=16, help="number of concurrent connections")
+    parser.add_argument("--duration", type=float, default=10.0, help="test duration in seconds")
+    parser.add_argument("--warmup", type=float, default=1.0, help="seconds of load sent before measuring")
+    args = parser.parse_args()
+
+    with open(args.model, "rb") as f:
+        body = f.read()
+
+    if args.warmup > 0:
+        run(args.url, body, args.concurrency, args.warmup)
+    latencies, errors, elapsed = run(args.url, body, args.concurrency, args.duration)
+
+    print(f"requests:     {len(latencies)} ok, {sum(errors.values())} failed in {elapsed:.1f} s")
+    print(f"throughput:   {len(latencies) / elapsed:.1f} requests/s")
+    for label, fraction in (("p50", 0.50), ("p90", 0.90), ("p99", 0.99), ("max", 1.0)):
+        print(f"latency {label}:  {percentile(latencies, fraction) * 1000:.2f} ms")
+    if errors:
+        print("errors:       " + ", ".join(f"{status}: {count}" for status, count in sorted(errors.items(), key=str)))
+
+
+if __name__ == "__main__":
+    main()
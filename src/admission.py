@@ -0,0 +1,224 @@
+"""
+This module contains the admission control of the scheduling API.
+
+The time a /schedule_jobs request takes grows with the size of its model, so one large request can keep a
+worker busy while small interactive requests from the visualization frontend wait behind it. Before a request
+is scheduled, its cost is estimated from the number of tasks, messages, nodes and links with a linear cost
+model, calibrated with benchmarks/calibrate_cost_model.py. Placing a task in the idle gaps of the nodes, with
+"insertion": true, looks at every compute core, so those requests also pay for the tasks times the cores. The request then waits in the queue of its size
+class, and each class runs a limited number of requests at a time, so small requests never wait for large ones.
+
+Requests estimated above the cost budget are rejected at once, as are requests finding the queue of their
+class full or waiting in it for too long. The limits hold per server worker process.
+
+Classes:
+- CostModel: Estimates the time a request takes from the sizes of its model.
+- SizeClass: Concurrency and queue limits of the requests up to a cost.
+- AdmissionController: Admits requests into their size class, or rejects them.
+- CostLimitExceeded: Raised for requests estimated above the cost budget.
+- QueueFull: Raised when a request cannot be admitted in time.
+
+Functions:
+- compute_cores: Counts the cores of the compute nodes of a platform without validating it.
+- model_counts: Counts the rows of the tables of a model without validating it.
+"""
+
+__version__ = "1.0.0"
+
+
+import asyncio
+from collections.abc import Mapping, Sequence
+from contextlib import asynccontextmanager
+
+
+# Tables counted by the cost model, the same as those of a stored model
+COST_TABLES = ("tasks", "messages", "nodes", "links")
+
+# Count of the cost model for requests with insertion: the tasks times the compute cores, 0 without insertion
+INSERTION_TASK_CORES = "insertion_task_cores"
+
+
+class CostLimitExceeded(Exception):
+    """Raised when the estimated cost of a request is above the budget."""
+
+
+class QueueFull(Exception):
+    """Raised when a request finds the queue of its size class full, or waits in it for too long."""
+
+
+def compute_cores(nodes):
+    """
+    Count the cores of the compute nodes of a platform.
+
+    The platform has not been validated yet, so malformed nodes are not counted and a compute node without a
+    valid number of cores counts as one core, as in the scheduling algorithms.
+
+    Args:
+        nodes (list): The nodes of a platform model, or the nodes table of a stored model.
+
+    Returns:
+        int: The number of compute cores.
+    """
+    if not isinstance(nodes, Sequence) or isinstance(nodes, str):
+        return 0
+    total = 0
+    for node in nodes:
+        if isinstance(node, Mapping) and node.get("type") == "compute":
+            cores = node.get("cores", 1)
+            total += cores if type(cores) is int and cores > 0 else 1
+    return total
+
+
+def model_counts(application_data, platform_data=None, insertion=False):
+    """
+    Count the rows of the tables of a model.
+
+    The model has not been validated yet, so missing or malformed tables count as empty. They are
+    rejected by the validation once the request is admitted.
+
+    Args:
+        application_data (dict): Application model with 'tasks' and 'messages'.
+        platform_data (dict): Platform model with 'nodes' and 'links'.
+        insertion (bool): Whether the request places tasks in idle gaps, as with "insertion": true.
+
+    Returns:
+        dict: The number of rows of each table in COST_TABLES, and the tasks times the compute cores under
+              INSERTION_TASK_CORES if insertion is on, else 0.
+    """
+    counts = {}
+    for part, table_names in ((application_data, ("tasks", "messages")), (platform_data, ("nodes", "links"))):
+        for table_name in table_names:
+            rows = part.get(table_name) if isinstance(part, dict) else None
+            counts[table_name] = len(rows) if isinstance(rows, list) else 0
+    nodes = platform_data.get("nodes") if isinstance(platform_data, dict) else None
+    counts[INSERTION_TASK_CORES] = counts["tasks"] * compute_cores(nodes) if insertion else 0
+    return counts
+
+
+class CostModel:
+    """
+    Linear model of the time, in milliseconds, a /schedule_jobs request takes.
+
+    cost = base + per_task * tasks + per_message * messages + per_node * nodes + per_link * links
+           + per_insertion_task_core * insertion_task_cores
+
+    Attributes:
+        base (float): Time taken by a request for an empty model.
+        coefficients (dict): Time added by each row of the tables in COST_TABLES, and by each task and compute
+                             core of requests with insertion.
+    """
+
+    def __init__(self, base, per_task, per_message, per_node, per_link, per_insertion_task_core=0):
+        self.base = base
+        self.coefficients = {
+            "tasks": per_task,
+            "messages": per_message,
+            "nodes": per_node,
+            "links": per_link,
+            INSERTION_TASK_CORES: per_insertion_task_core,
+        }
+
+    def estimate(self, counts):
+        """Estimate the cost of a request from the counts of its model, as returned by model_counts."""
+        return self.base + sum(coefficient * counts.get(count_name, 0) for count_name, coefficient in self.coefficients.items())
+
+
+class SizeClass:
+    """
+    Limits of the requests whose estimated cost is at most max_cost.
+
+    Attributes:
+        name (str): Name of the class, e.g. 'small'.
+        max_cost (float): Largest estimated cost of the requests in the class.
+        concurrency (int): Number of requests of the class running at the same time.
+        queue_size (int): Number of requests of the class waiting to run, further requests are rejected.
+    """
+
+    def __init__(self, name, max_cost, concurrency, queue_size):
+        self.name = name
+        self.max_cost = max_cost
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.waiting = 0
+        # Created on first use, so it belongs to the event loop of the server worker
+        self._semaphore = None
+
+    @property
+    def semaphore(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+
+class AdmissionController:
+    """
+    Admit requests into the size class of their estimated cost.
+
+    Each class has its own limits, so requests only ever wait for requests of the same size.
+
+    Attributes:
+        cost_model (CostModel): Estimates the cost of requests.
+        size_classes (list): SizeClass objects ordered by increasing max_cost. A request falls into the first
+                             class whose max_cost is at least its cost.
+        max_cost (float): Budget above which requests are rejected, 0 for no budget.
+        queue_timeout (float): Seconds a request may wait in its queue before it is rejected.
+    """
+
+    def __init__(self, cost_model, size_classes, max_cost=0, queue_timeout=10):
+        self.cost_model = cost_model
+        self.size_classes = sorted(size_classes, key=lambda size_class: size_class.max_cost)
+        self.max_cost = max_cost
+        self.queue_timeout = queue_timeout
+
+    def classify(self, cost):
+        """
+        Find the size class of a request.
+
+        Raises:
+            CostLimitExceeded: If the cost is above the budget or above the max_cost of every class.
+
+        Returns:
+            SizeClass: The class the request is admitted into.
+        """
+        if self.max_cost and cost > self.max_cost:
+            raise CostLimitExceeded(f"Estimated cost {cost:.0f} ms is above the budget of {self.max_cost:.0f} ms")
+        for size_class in self.size_classes:
+            if cost <= size_class.max_cost:
+                return size_class
+        raise CostLimitExceeded(f"Estimated cost {cost:.0f} ms is above the largest size class")
+
+    @asynccontextmanager
+    async def admit(self, counts):
+        """
+        Wait until a request may run, and hold its place in its size class while it does.
+
+        Args:
+            counts (dict): The row counts of the request's model, as returned by model_counts.
+
+        Raises:
+            CostLimitExceeded: If the estimated cost of the request is above the budget.
+            QueueFull: If the queue of its class is full or the request waited longer than queue_timeout.
+
+        Yields:
+            SizeClass: The class the request was admitted into.
+        """
+        size_class = self.classify(self.cost_model.estimate(counts))
+        semaphore = size_class.semaphore
+        # Requests only queue when the class is busy, and only as many as the queue holds
+        if semaphore.locked():
+            if size_class.waiting >= size_class.queue_size:
+                raise QueueFull(f"The queue of {size_class.name} requests is full")
+            size_class.waiting += 1
+            try:
+                await asyncio.wait_for(semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                raise QueueFull(f"Timed out waiting in the queue of {size_class.name} requests")
+            finally:
+                size_class.waiting -= 1
+        else:
+            await semaphore.acquire()
+
+        try:
+            yield size_class
+        finally:
+            semaphore.release()
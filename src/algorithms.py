@@ -3,6 +3,9 @@ This module contains the scheduling algorithms used in the scheduling API.
 
 It provides implementations for both Least Deadline First (LDF) and Earliest Deadline First (EDF) scheduling strategies, applicable in single-core and multi-core processor environments. Functions within are designed to be called with specific application and platform data structures.
 
+Every algorithm takes an optional `progress` callback, called with each schedule entry as soon as its task is placed, or with None
+for a task that is skipped because it cannot meet its deadline. It lets callers stream a schedule while it is computed.
+
 Functions:
 - ldf_singlecore: Schedules tasks on a single-core processor using LDF.
 - edf_singlecore: Schedules tasks on a single-core processor using EDF.
@@ -16,9 +19,11 @@ __author__ = "Priya Nagar"
 __version__ = "1.0.0"
 
 
-import networkx as nx
 from collections import defaultdict, deque
 
+from node_pool import NodePool
+from task_graph import TaskGraph
+
 example_schedule = [
     {
         "task_id": 3,
@@ -51,7 +56,7 @@ example_schedule = [
 ]
 
 # Implementation done by Usman Ahmed Saeed
-def ldf_single_node(application_data):
+def ldf_single_node(application_data, progress=None):
     # There are two further methods in this method to clearly break down the work that is needed to be done, and increase readibility
     # Extract tasks and messages from the application_data
     tasks = application_data["tasks"]
@@ -114,6 +119,9 @@ def ldf_single_node(application_data):
             # Check if the task can be completed within its deadline
             if end_time > task['deadline']:
                 print(f"Task {task['id']} cannot be scheduled within its deadline.")
+                # Report the skipped task to the progress callback, if any, as a task without an entry
+                if progress is not None:
+                    progress(None)
                 # Skip tasks that cannot meet their deadline
                 continue  
             
@@ -125,6 +133,9 @@ def ldf_single_node(application_data):
                 "end_time": end_time,
                 "deadline": task["deadline"]
             })
+            # Report the new entry to the progress callback, if any, e.g. to stream the schedule while it is computed
+            if progress is not None:
+                progress(schedule[-1])
             # Move the current time forward by the task's execution time
             current_time += task["wcet"]  
         
@@ -141,7 +152,7 @@ def ldf_single_node(application_data):
     return result 
 
 # Implementation done by Adnan Akin Okcu using ldf_singlenode with non-reverse sorting
-def edf_single_node(application_data):
+def edf_single_node(application_data, progress=None):
    # There are two further methods in this method to clearly break down the work that is needed to be done, and increase readibility
     # Extract tasks and messages from the application_data
     tasks = application_data["tasks"]
@@ -204,6 +215,9 @@ def edf_single_node(application_data):
             # Check if the task can be completed within its deadline
             if end_time > task['deadline']:
                 print(f"Task {task['id']} cannot be scheduled within its deadline.")
+                # Report the skipped task to the progress callback, if any, as a task without an entry
+                if progress is not None:
+                    progress(None)
                 # Skip tasks that cannot meet their deadline
                 continue  
             
@@ -215,6 +229,9 @@ def edf_single_node(application_data):
                 "end_time": end_time,
                 "deadline": task["deadline"]
             })
+            # Report the new entry to the progress callback, if any, e.g. to stream the schedule while it is computed
+            if progress is not None:
+                progress(schedule[-1])
             # Move the current time forward by the task's execution time
             current_time += task["wcet"]  
         
@@ -231,25 +248,20 @@ def edf_single_node(application_data):
     return result 
 
 # Implementation done by Safouane Chahid
-def ll_multinode(application_data, platform_data):
+def ll_multinode(application_data, platform_data, insertion=False, progress=None):
  
-    tasks = application_data['tasks']
-    nodes = platform_data['nodes']
-    node_availability = {node['id']: 0 for node in nodes}
+    # Track when each core of the compute nodes becomes available. With insertion, tasks may also fill
+    # idle gaps left between earlier tasks on a node
+    node_pool = NodePool(platform_data['nodes'], insertion=insertion)
 
     # Create a directed graph for task dependencies
-    task_graph = nx.DiGraph()
-    for task in tasks:
-        task_graph.add_node(task['id'], wcet=task['wcet'], deadline=task['deadline'])
-
-    for message in application_data.get('messages', []):
-        task_graph.add_edge(message['sender'], message['receiver'])
+    task_graph = TaskGraph.from_application(application_data)
 
-    if not nx.is_directed_acyclic_graph(task_graph):
+    if not task_graph.is_directed_acyclic_graph():
         raise ValueError("The task dependency graph has cycles, which is not supported.")
 
     # Compute topological ordering to ensure tasks are scheduled in dependency order
-    sorted_tasks = list(nx.topological_sort(task_graph))
+    sorted_tasks = task_graph.topological_sort()
 
     schedule = {}
     for task_id in sorted_tasks:
@@ -260,11 +272,10 @@ def ll_multinode(application_data, platform_data):
         # Determine the earliest time the task can start by checking the end times of all predecessors
         earliest_start_time = max((schedule[pred]['end_time'] for pred in task_graph.predecessors(task_id) if pred in schedule), default=0)
 
-        # Find the earliest available node after the last predecessor has finished
-        node_id = min(nodes, key=lambda n: max(earliest_start_time, node_availability[n['id']]))['id']
-
-        start_time = max(earliest_start_time, node_availability[node_id])
-        end_time = start_time + wcet
+        # Find the node that finishes the task earliest after the last predecessor has finished,
+        # so faster nodes are preferred when they are not busy for too long
+        placement = node_pool.earliest_finish(earliest_start_time, wcet)
+        node_id, _, start_time, end_time = placement
 
         if end_time > deadline:
             raise Exception(f"Task {task_id} cannot meet its deadline. Scheduling failed.")
@@ -276,7 +287,10 @@ def ll_multinode(application_data, platform_data):
             "end_time": end_time,
             "deadline": deadline
         }
-        node_availability[node_id] = end_time  # Update the node's availability
+        node_pool.assign(placement)  # Update the node's availability
+        # Report the new entry to the progress callback, if any, e.g. to stream the schedule while it is computed
+        if progress is not None:
+            progress(schedule[task_id])
 
     return {
         "schedule": list(schedule.values()),
@@ -284,15 +298,15 @@ def ll_multinode(application_data, platform_data):
     }
 
 # Implementation done by Usman Ahmed Saeed
-def ldf_multinode(application_data, platform_data):
+def ldf_multinode(application_data, platform_data, insertion=False, progress=None):
     # As in the Single node LDF method, there are also two methods or helper function you say to provide better readibility to the code base
     # Extract tasks and messages from the application_data as provided
     tasks = application_data["tasks"]
     messages = application_data["messages"]
 
-    # Extract compute nodes and initialize their availability times from the platform_data
-    nodes = platform_data['nodes']
-    compute_nodes = {node['id']: 0 for node in nodes if node['type'] == 'compute'}
+    # Extract compute nodes and track when each of their cores is available from the platform_data.
+    # With insertion, tasks may also fill idle gaps left between earlier tasks on a node
+    node_pool = NodePool(platform_data['nodes'], insertion=insertion)
 
     # Initialize dictionaries to hold dependencies and in-degrees of tasks for their relationships
     dependencies = defaultdict(list)
@@ -323,12 +337,15 @@ def ldf_multinode(application_data, platform_data):
 
         if len(sorted_tasks) != len(tasks):
             # This if condition handles any tasks which have multiple dependencies that needs to be taken care of such as Task 1 depends task 2, and task 3, and task 0 depends on task 1.
-            remaining_tasks = {task["id"] for task in tasks if task["id"] not in sorted_tasks}
+            # A set of the sorted tasks keeps the membership checks constant time
+            sorted_task_set = set(sorted_tasks)
+            remaining_tasks = {task["id"] for task in tasks if task["id"] not in sorted_task_set}
             while remaining_tasks:
                 for task_id in list(remaining_tasks):
                     # Check if all dependencies of the task are already in sorted_tasks
-                    if all(dep in sorted_tasks for dep in dependencies[task_id]):
+                    if all(dep in sorted_task_set for dep in dependencies[task_id]):
                         sorted_tasks.append(task_id)
+                        sorted_task_set.add(task_id)
                         remaining_tasks.remove(task_id)
         # Return the topologically sorted task IDs
         return sorted_tasks 
@@ -348,28 +365,30 @@ def ldf_multinode(application_data, platform_data):
     # Track completion times of tasks so that any task that is dependent on a particular task does not start before its predecessor where we maintain 
     # this completion times list to track every end time of a task.
     completion_times = {}
+    # Create a map from task IDs to task details for quick lookup
+    task_map = {task["id"]: task for task in tasks}
 
     # Schedule tasks on multi-node system
     for task_id in topologically_sorted_tasks:
         # Gets the next task in order
-        task = next(task for task in tasks if task['id'] == task_id)
+        task = task_map[task_id]
 
         # Gets the end time of the prodecessors on which the current task is dependent on so that it does not start before it.
         predecessors_end_times = [completion_times.get(predecessor, 0) for predecessor in dependencies[task_id]]
         # Extracting value of the end time and checking if the end time is there or assign 0 as the end time where there are no dependency on the current task.
         max_predecessor_end_time = max(predecessors_end_times) if predecessors_end_times else 0
 
-        # Find the node with the earliest available time
-        node_id = min(compute_nodes, key=compute_nodes.get)
-        earliest_time = compute_nodes[node_id]
-
-        # Ensure the task starts only after its predecessor has completed and the node is available
-        start_time = max(max_predecessor_end_time, earliest_time)
-        end_time = start_time + task['wcet']
+        # Find the node with the earliest finish time, taking node speeds and free cores into account.
+        # The task starts only after its predecessor has completed and the node is available
+        placement = node_pool.earliest_finish(max_predecessor_end_time, task['wcet'])
+        node_id, _, start_time, end_time = placement
 
         # Check if the task can be completed within its deadline
         if end_time > task['deadline']:
             print(f"Task {task['id']} cannot be scheduled within its deadline.")
+            # Report the skipped task to the progress callback, if any, as a task without an entry
+            if progress is not None:
+                progress(None)
             continue  
 
         # Append the task to the schedule list
@@ -380,12 +399,15 @@ def ldf_multinode(application_data, platform_data):
             'end_time': end_time,
             'deadline': task['deadline']
         })
+        # Report the new entry to the progress callback, if any, e.g. to stream the schedule while it is computed
+        if progress is not None:
+            progress(schedule[-1])
 
         # Update the completion time for the task
         completion_times[task_id] = end_time
 
         # Update the availability time for the specific node
-        compute_nodes[node_id] = end_time
+        node_pool.assign(placement)
 
     # Return the result in the required format
     result = {
@@ -396,15 +418,15 @@ def ldf_multinode(application_data, platform_data):
     return result
 
 # Implementation done by Adnan Akin Okcu using ldf_multinode with non-reverse sorting
-def edf_multinode(application_data, platform_data):
+def edf_multinode(application_data, platform_data, insertion=False, progress=None):
    # As in the Single node LDF method, there are also two methods or helper function you say to provide better readibility to the code base
     # Extract tasks and messages from the application_data as provided
     tasks = application_data["tasks"]
     messages = application_data["messages"]
 
-    # Extract compute nodes and initialize their availability times from the platform_data
-    nodes = platform_data['nodes']
-    compute_nodes = {node['id']: 0 for node in nodes if node['type'] == 'compute'}
+    # Extract compute nodes and track when each of their cores is available from the platform_data.
+    # With insertion, tasks may also fill idle gaps left between earlier tasks on a node
+    node_pool = NodePool(platform_data['nodes'], insertion=insertion)
 
     # Initialize dictionaries to hold dependencies and in-degrees of tasks for their relationships
     dependencies = defaultdict(list)
@@ -435,12 +457,15 @@ def edf_multinode(application_data, platform_data):
 
         if len(sorted_tasks) != len(tasks):
             # This if condition handles any tasks which have multiple dependencies that needs to be taken care of such as Task 1 depends task 2, and task 3, and task 0 depends on task 1.
-            remaining_tasks = {task["id"] for task in tasks if task["id"] not in sorted_tasks}
+            # A set of the sorted tasks keeps the membership checks constant time
+            sorted_task_set = set(sorted_tasks)
+            remaining_tasks = {task["id"] for task in tasks if task["id"] not in sorted_task_set}
             while remaining_tasks:
                 for task_id in list(remaining_tasks):
                     # Check if all dependencies of the task are already in sorted_tasks
-                    if all(dep in sorted_tasks for dep in dependencies[task_id]):
+                    if all(dep in sorted_task_set for dep in dependencies[task_id]):
                         sorted_tasks.append(task_id)
+                        sorted_task_set.add(task_id)
                         remaining_tasks.remove(task_id)
         # Return the topologically sorted task IDs
         return sorted_tasks 
@@ -460,28 +485,30 @@ def edf_multinode(application_data, platform_data):
     # Track completion times of tasks so that any task that is dependent on a particular task does not start before its predecessor where we maintain 
     # this completion times list to track every end time of a task.
     completion_times = {}
+    # Create a map from task IDs to task details for quick lookup
+    task_map = {task["id"]: task for task in tasks}
 
     # Schedule tasks on multi-node system
     for task_id in topologically_sorted_tasks:
         # Gets the next task in order
-        task = next(task for task in tasks if task['id'] == task_id)
+        task = task_map[task_id]
 
         # Gets the end time of the prodecessors on which the current task is dependent on so that it does not start before it.
         predecessors_end_times = [completion_times.get(predecessor, 0) for predecessor in dependencies[task_id]]
         # Extracting value of the end time and checking if the end time is there or assign 0 as the end time where there are no dependency on the current task.
         max_predecessor_end_time = max(predecessors_end_times) if predecessors_end_times else 0
 
-        # Find the node with the earliest available time
-        node_id = min(compute_nodes, key=compute_nodes.get)
-        earliest_time = compute_nodes[node_id]
-
-        # Ensure the task starts only after its predecessor has completed and the node is available
-        start_time = max(max_predecessor_end_time, earliest_time)
-        end_time = start_time + task['wcet']
+        # Find the node with the earliest finish time, taking node speeds and free cores into account.
+        # The task starts only after its predecessor has completed and the node is available
+        placement = node_pool.earliest_finish(max_predecessor_end_time, task['wcet'])
+        node_id, _, start_time, end_time = placement
 
         # Check if the task can be completed within its deadline
         if end_time > task['deadline']:
             print(f"Task {task['id']} cannot be scheduled within its deadline.")
+            # Report the skipped task to the progress callback, if any, as a task without an entry
+            if progress is not None:
+                progress(None)
             continue  
 
         # Append the task to the schedule list
@@ -492,12 +519,15 @@ def edf_multinode(application_data, platform_data):
             'end_time': end_time,
             'deadline': task['deadline']
         })
+        # Report the new entry to the progress callback, if any, e.g. to stream the schedule while it is computed
+        if progress is not None:
+            progress(schedule[-1])
 
         # Update the completion time for the task
         completion_times[task_id] = end_time
 
         # Update the availability time for the specific node
-        compute_nodes[node_id] = end_time
+        node_pool.assign(placement)
 
     # Return the result in the required format
     result = {
@@ -1,11 +1,18 @@
 """
-This module defines the FastAPI app and its routes for scheduling jobs. When run as a script, it starts a uvicorn server on port defined in the config.py file.
+This module defines the FastAPI app and its routes for scheduling jobs. When run as a script, it starts a single-process uvicorn development server
+on port defined in the config.py file. Use server.py to run the app with multiple workers in production.
 
 The app uses CORS middleware to handle cross-origin requests and defines endpoints to schedule jobs and retrieve job information. It interacts with the `algorithms` module
-to calculate schedules based on different scheduling algorithms.
+to calculate schedules based on different scheduling algorithms. Requests to schedule jobs are admitted by the `admission` module according
+to their estimated cost, so large models are rejected or wait for each other rather than delay small ones.
 
 Endpoints:
-- POST /schedule_jobs: Accepts JSON payload to schedule jobs based on application and platform data.
+- POST /schedule_jobs: Accepts JSON payload to schedule jobs based on application and platform data, or on a stored model.
+- POST /schedule_jobs/stream: Schedules jobs like /schedule_jobs, streaming each schedule and its progress as Server-Sent Events or NDJSON.
+- POST /models: Stores a model so that later requests can refer to it by id.
+- GET /models/{model_id}: Returns the size and table sizes of a stored model.
+- POST /verify_schedule: Checks a schedule against its application and platform data, or a stored model.
+- DELETE /models/{model_id}: Deletes a stored model.
 - GET /: Provides a basic test endpoint to confirm the app is running.
 
 See the function docstrings within this module for more detailed API documentation.
@@ -15,17 +22,57 @@ __author__ = "Utkarsh Raj"
 __version__ = "1.0.0"
 
 
+from contextlib import AsyncExitStack, asynccontextmanager
 from fastapi import HTTPException
 from fastapi import FastAPI
+from fastapi import Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-import uvicorn
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 import json
 import jsonschema
-from jsonschema import validate
+from jsonschema import Draft7Validator
 import os
 
-from config import SERVER_PORT, SERVER_HOST
+from config import SERVER_PORT, SERVER_HOST, SERVER_MAX_REQUEST_SIZE, MODEL_STORE_DIR, MODEL_STORE_MAX_BYTES
+from config import (
+    COST_MODEL_BASE,
+    COST_MODEL_PER_TASK,
+    COST_MODEL_PER_MESSAGE,
+    COST_MODEL_PER_NODE,
+    COST_MODEL_PER_LINK,
+    COST_MODEL_PER_INSERTION_TASK_CORE,
+    ADMISSION_SMALL_MAX_COST,
+    ADMISSION_SMALL_CONCURRENCY,
+    ADMISSION_SMALL_QUEUE,
+    ADMISSION_MEDIUM_MAX_COST,
+    ADMISSION_MEDIUM_CONCURRENCY,
+    ADMISSION_MEDIUM_QUEUE,
+    ADMISSION_LARGE_CONCURRENCY,
+    ADMISSION_LARGE_QUEUE,
+    ADMISSION_MAX_COST,
+    ADMISSION_QUEUE_TIMEOUT,
+    STREAM_BUFFER_SIZE,
+    STREAM_CHUNK_SIZE,
+    STREAM_CHUNK_INTERVAL,
+)
+from admission import (
+    AdmissionController,
+    CostModel,
+    SizeClass,
+    CostLimitExceeded,
+    QueueFull,
+    INSERTION_TASK_CORES,
+    compute_cores,
+    model_counts,
+)
 import algorithms as alg
+from decompose import schedule_components
+from model_store import ModelStore, MODEL_TABLES
+from streaming import EventStream, ScheduleProgress, StreamClosed, STREAM_FORMATS
+from task_graph import TaskGraph
+from verifier import verify_schedule as find_violations
 
 
 script_dir = os.path.dirname(__file__)
@@ -39,7 +86,149 @@ with open(input_schema_file) as f:
 with open(output_schema_file) as f:
     output_schema = json.load(f)
 
+## Compile the validators once at import, so the production server builds them before forking
+## its workers and every request skips re-checking the schemas themselves
+input_validator = Draft7Validator(input_schema)
+output_validator = Draft7Validator(output_schema)
+
+## Requests for a stored model carry its id and optionally partial rows overriding some of its parameters.
+## Each override has the fields of a row of the input schema, of which only the id is required
+stored_model_schema = {
+    "type": "object",
+    "properties": {
+        "model_id": {"type": "string"},
+        "insertion": input_schema["properties"]["insertion"],
+        "overrides": {
+            "type": "object",
+            "properties": {
+                table_name: {
+                    "type": "array",
+                    "items": dict(input_schema["properties"][part]["properties"][table_name]["items"], required=["id"]),
+                }
+                for part, table_names in MODEL_TABLES.items()
+                for table_name in table_names
+            },
+            "additionalProperties": False,
+        },
+    },
+    "required": ["model_id"],
+}
+stored_model_validator = Draft7Validator(stored_model_schema)
+
+## Requests to verify a schedule carry the schedule, as in the output schema, next to the model it was made for
+verify_schema = {
+    "type": "object",
+    "properties": {
+        "application": input_schema["properties"]["application"],
+        "platform": input_schema["properties"]["platform"],
+        "schedule": output_schema["properties"]["schedule"],
+        "check_platform": {"type": "boolean"},
+        "check_communication": {"type": "boolean"},
+    },
+    "required": ["schedule"],
+    "oneOf": [{"required": ["application"]}, {"required": ["model_id"]}],
+}
+verify_validator = Draft7Validator(verify_schema)
+
+model_store = ModelStore(MODEL_STORE_DIR, MODEL_STORE_MAX_BYTES)
+
+## The scheduling algorithms run for each request, by the key of their schedule in the response,
+## and whether they schedule on the nodes of the platform
+schedulers = {
+    "schedule1": (alg.ldf_single_node, False),
+    "schedule2": (alg.edf_single_node, False),
+    "schedule3": (alg.ll_multinode, True),
+    "schedule4": (alg.ldf_multinode, True),
+    "schedule5": (alg.edf_multinode, True),
+}
+
+## Requests to /schedule_jobs wait for their size class, so small requests are not held up by large ones
+admission = AdmissionController(
+    CostModel(
+        COST_MODEL_BASE,
+        COST_MODEL_PER_TASK,
+        COST_MODEL_PER_MESSAGE,
+        COST_MODEL_PER_NODE,
+        COST_MODEL_PER_LINK,
+        COST_MODEL_PER_INSERTION_TASK_CORE,
+    ),
+    [
+        SizeClass("small", ADMISSION_SMALL_MAX_COST, ADMISSION_SMALL_CONCURRENCY, ADMISSION_SMALL_QUEUE),
+        SizeClass("medium", ADMISSION_MEDIUM_MAX_COST, ADMISSION_MEDIUM_CONCURRENCY, ADMISSION_MEDIUM_QUEUE),
+        SizeClass("large", float("inf"), ADMISSION_LARGE_CONCURRENCY, ADMISSION_LARGE_QUEUE),
+    ],
+    ADMISSION_MAX_COST,
+    ADMISSION_QUEUE_TIMEOUT,
+)
+
+
+class RequestSizeLimitMiddleware:
+    """
+    ASGI middleware that rejects request bodies larger than max_body_size with a 413.
+
+    The declared Content-Length is checked before the endpoint runs, and bodies sent without one
+    are counted while they are received. A Content-Length that is not a number gets a 400.
+    """
+
+    def __init__(self, app, max_body_size):
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.max_body_size:
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name != b"content-length":
+                continue
+            try:
+                content_length = int(value)
+            except ValueError:
+                await self._reject(send, 400, "Invalid Content-Length header")
+                return
+            if content_length > self.max_body_size:
+                await self._reject(send)
+                return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    raise HTTPException(413, "Request body too large")
+            return message
+
+        async def tracked_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracked_send)
+        except HTTPException as err:
+            if err.status_code != 413 or response_started:
+                raise
+            await self._reject(send)
+
+    @staticmethod
+    async def _reject(send, status=413, detail="Request body too large"):
+        body = json.dumps({"detail": detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
 app = FastAPI()
+app.add_middleware(RequestSizeLimitMiddleware, max_body_size=SERVER_MAX_REQUEST_SIZE)
 origins = [
     "http://localhost:3000",
     "http://localhost:3001",
@@ -56,7 +245,7 @@ app.add_middleware(
 
 
 @app.post("/schedule_jobs")
-def schedule_jobs(data: dict):
+async def schedule_jobs(data: dict):
     """
     Schedule jobs based on the provided application and platform data.
 
@@ -65,11 +254,25 @@ def schedule_jobs(data: dict):
     Rate Monotonic (RMS) and Least Laxity (LL) scheduling algorithms
     on single-core setups.
 
+    If 'insertion' is true, the multi-node algorithms may place tasks in idle gaps between earlier tasks on a node.
+
+    Instead of the 'application' and 'platform' data, the payload can contain the 'model_id' of a model stored
+    with POST /models, and optionally 'overrides' changing some of its parameters, e.g.
+    {"model_id": "...", "overrides": {"tasks": [{"id": 3, "deadline": 500}]}}.
+
+    Before it is scheduled, the request waits until its size class, given by the cost estimated from the sizes
+    of its model, may run another request. See the admission module. The cost is estimated from the parsed
+    body, so a request above the budget has already been read and parsed when it gets its 413. Bodies above
+    SERVER_MAX_REQUEST_SIZE are rejected earlier, while they are read, by RequestSizeLimitMiddleware.
+
     Args:
         data (dict): A dictionary containing 'application' and 'platform' data necessary for scheduling.
 
     Raises:
         HTTPException: If the 'application' or 'platform' data is missing or malformed, a 400 error is raised.
+                       If the stored model does not exist, a 404 error is raised.
+                       If the estimated cost of the request is above the budget, a 413 error is raised.
+                       If the queue of its size class is full or the request waited too long, a 429 error is raised.
 
     Returns:
         dict: A dictionary containing schedules calculated using different algorithms:
@@ -78,37 +281,180 @@ def schedule_jobs(data: dict):
               - schedule3: Schedule using Rate Monotonic Scheduling (RMS) on single-core.
               - schedule4: Schedule using Least Laxity (LL) on single-core.
     """
+    async with admitted(data):
+        ## Scheduling is CPU bound, so it runs in a thread and the event loop keeps admitting requests
+        return await run_in_threadpool(compute_schedules, data)
 
-    print("Received JSON data:", json.dumps(data, indent=4))
 
-    ## Validate the input as per input schema
+@app.post("/schedule_jobs/stream")
+async def schedule_jobs_stream(data: dict, stream_format: str = Query("sse", alias="format"), progress: bool = True):
+    """
+    Schedule jobs like /schedule_jobs, streaming each schedule as soon as its algorithm finishes.
+
+    The response is a stream of Server-Sent Events, or of newline-delimited JSON objects with 'event' and 'data'
+    if 'format' is 'ndjson'. The events are, in order:
+    - start: {"schedules": [...], "total": ...} with the keys of the schedules that follow and the number of tasks.
+    - chunk: {"key": ..., "placed": ..., "total": ..., "entries": [...]} with the entries an algorithm has placed
+      since its previous chunk, unless 'progress' is false. Models whose components are scheduled in parallel are
+      reported a group of components at a time, as each group finishes.
+    - schedule: {"key": ..., "result": {...}} with the result of an algorithm, as in /schedule_jobs. If 'progress' is
+      true its entries were already sent in chunks, so 'schedule' is left out of the result and only the rest, e.g.
+      'name' and 'missed_deadlines', is sent.
+    - error: {"key": ..., "detail": ...} instead of 'schedule' if an algorithm fails. The other algorithms still run.
+    - end: {} once all algorithms have finished.
+
+    The request is admitted like /schedule_jobs and holds its place in its size class until all algorithms have
+    finished, or the client goes away, rather than until the client has read the whole stream.
+
+    Args:
+        data (dict): The request, as for /schedule_jobs.
+        stream_format (str): 'sse' (default) or 'ndjson', given as the 'format' query parameter.
+        progress (bool): Emit chunks of entries while each algorithm runs. Default is true.
+
+    Raises:
+        HTTPException: As /schedule_jobs, before the stream starts, and 400 if the format is unknown.
+
+    Returns:
+        StreamingResponse: The stream of events.
+    """
+    if stream_format not in STREAM_FORMATS:
+        raise HTTPException(400, f"Unknown stream format, use one of {', '.join(STREAM_FORMATS)}")
+
+    ## The request is admitted here, so it is rejected with an error status rather than in the stream,
+    ## and released once the algorithms have finished or the client goes away
+    admission_stack = AsyncExitStack()
+    await admission_stack.enter_async_context(admitted(data))
     try:
-        validate(instance=data, schema=input_schema)
-        print("Input data is valid.")
-    except jsonschema.exceptions.ValidationError as err:
-        print("Input data is invalid:", err)
-        raise HTTPException(400, "Invalid Input schema")
+        application_data, platform_data = await run_in_threadpool(load_request_model, data)
+    except BaseException:
+        await admission_stack.aclose()
+        raise
+    insertion = data.get("insertion", False)
+
+    def produce(emit):
+        total = len(application_data["tasks"])
+        emit("start", {"schedules": list(schedulers), "total": total})
+        for key in schedulers:
+            schedule_progress = ScheduleProgress(emit, key, total, STREAM_CHUNK_SIZE, STREAM_CHUNK_INTERVAL) if progress else None
+            try:
+                result = run_scheduler(key, application_data, platform_data, insertion, schedule_progress)
+                output_validator.validate(result)
+            except StreamClosed:
+                raise
+            except jsonschema.exceptions.ValidationError as err:
+                print("Output data is not valid", err)
+                emit("error", {"key": key, "detail": "Invalid Output Schema"})
+                continue
+            except Exception as err:
+                print(key, "failed:", err)
+                emit("error", {"key": key, "detail": str(err)})
+                continue
+            if schedule_progress is not None:
+                schedule_progress.flush()
+                ## The entries were already sent in chunks
+                result = {name: value for name, value in result.items() if name != "schedule"}
+            emit("schedule", {"key": key, "result": result})
+        emit("end", {})
+
+    async def events():
+        try:
+            async for event in EventStream(produce, stream_format, STREAM_BUFFER_SIZE, admission_stack.aclose):
+                yield event
+        finally:
+            await admission_stack.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type=STREAM_FORMATS[stream_format],
+        ## Stop proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        ## Also releases the admission if the client went away before the stream started
+        background=BackgroundTask(admission_stack.aclose),
+    )
+
+
+@asynccontextmanager
+async def admitted(data):
+    """
+    Wait until a scheduling request is admitted, and hold its place in its size class.
+
+    The cost of a stored model is read from its file in a worker thread, so the event loop is not blocked by
+    disk I/O.
+
+    Args:
+        data (dict): The request, as for /schedule_jobs.
+
+    Raises:
+        HTTPException: 413 if the estimated cost of the request is above the budget, 429 if the queue of its
+                       size class is full or it waited too long.
+    """
+    if "model_id" in data:
+        counts = await run_in_threadpool(request_counts, data)
+    else:
+        counts = request_counts(data)
+    try:
+        async with admission.admit(counts):
+            yield
+    except CostLimitExceeded as err:
+        print("Request rejected:", err)
+        raise HTTPException(413, str(err))
+    except QueueFull as err:
+        print("Request rejected:", err)
+        raise HTTPException(429, str(err), headers={"Retry-After": str(max(1, round(admission.queue_timeout)))})
+
+
+def request_counts(data):
+    """
+    Count the rows of the model of a /schedule_jobs request, before it is validated, to estimate its cost.
+
+    Args:
+        data (dict): The request, with 'application' and 'platform' data or the 'model_id' of a stored model.
+
+    Returns:
+        dict: The number of rows of each table, and the tasks times the compute cores if 'insertion' is on. Tables
+              of missing models count as empty, the request is then rejected once admitted.
+    """
+    insertion = data.get("insertion") is True
+    if "model_id" not in data:
+        return model_counts(data.get("application"), data.get("platform"), insertion)
+    if not isinstance(data["model_id"], str):
+        return {}
+    try:
+        stored = model_store.get(data["model_id"])
+    except KeyError:
+        return {}
+    counts = stored.counts()
+    # Insertion looks at every compute core for each task, so its cost grows with both
+    counts[INSERTION_TASK_CORES] = counts.get("tasks", 0) * compute_cores(stored.tables.get("nodes")) if insertion else 0
+    return counts
+
+
+def compute_schedules(data):
+    """
+    Validate a /schedule_jobs request and run every scheduling algorithm on its model.
+
+    Args:
+        data (dict): The request, as for /schedule_jobs.
+
+    Raises:
+        HTTPException: 400 if the model is malformed, 404 if the stored model does not exist.
+
+    Returns:
+        dict: The schedules of all algorithms, as returned by /schedule_jobs.
+    """
+    print("Received JSON data:", json.dumps(data, indent=4))
+
+    application_data, platform_data = load_request_model(data)
+
+    ## Let the multi-node algorithms fill idle gaps between tasks if requested
+    insertion = data.get("insertion", False)
+
+    response = {key: run_scheduler(key, application_data, platform_data, insertion) for key in schedulers}
 
-    application_data = data.get("application")
-    platform_data = data.get("platform")
-
-    ldf_single_node = alg.ldf_single_node(application_data)
-    edf_single_node = alg.edf_single_node(application_data)
-    ll_multinode = alg.ll_multinode(application_data, platform_data)
-    ldf_multinode = alg.ldf_multinode(application_data, platform_data)
-    edf_multinode = alg.edf_multinode(application_data, platform_data)
-
-    response = {
-        "schedule1": ldf_single_node,
-        "schedule2": edf_single_node,
-        "schedule3": ll_multinode,
-        "schedule4": ldf_multinode,
-        "schedule5": edf_multinode,
-    }
     ## Validate the schedules as per output schema
     try:
         for key, value in response.items():
-            validate(instance=value, schema=output_schema)
+            output_validator.validate(value)
             print(key, "Schedule is valid")
     except jsonschema.exceptions.ValidationError as err:
         print("Output data is not valid", err)
@@ -118,6 +464,203 @@ def schedule_jobs(data: dict):
     return response
 
 
+def load_request_model(data):
+    """
+    Validate the model of a /schedule_jobs request and return it.
+
+    Args:
+        data (dict): The request, with 'application' and 'platform' data or the 'model_id' of a stored model.
+
+    The task dependency graph is checked for cycles once here, before any algorithm runs, as the algorithms
+    cannot order the tasks of a cycle.
+
+    Raises:
+        HTTPException: 400 if the model is malformed or its tasks depend on each other in a cycle, 404 if the
+            stored model does not exist.
+
+    Returns:
+        tuple: The application data and the platform data.
+    """
+    if "model_id" in data:
+        application_data, platform_data = load_stored_model(data)
+    else:
+        ## Validate the input as per input schema
+        try:
+            input_validator.validate(data)
+            print("Input data is valid.")
+        except jsonschema.exceptions.ValidationError as err:
+            print("Input data is invalid:", err)
+            raise HTTPException(400, "Invalid Input schema")
+        application_data, platform_data = data.get("application"), data.get("platform")
+
+    if not TaskGraph.from_application(application_data).is_directed_acyclic_graph():
+        print("Input data is invalid: the task dependency graph has cycles")
+        raise HTTPException(400, "The task dependency graph has cycles")
+
+    return application_data, platform_data
+
+
+def run_scheduler(key, application_data, platform_data, insertion, progress=None):
+    """
+    Run the scheduling algorithm of a schedule in the /schedule_jobs response.
+
+    Args:
+        key (str): The key of the schedule in the response, e.g. 'schedule4'.
+        application_data (dict): The application model.
+        platform_data (dict): The platform model, used by the multi-node algorithms.
+        insertion (bool): Let the multi-node algorithms fill idle gaps between tasks.
+        progress (function): Optional callback called with each schedule entry as it is placed.
+
+    Returns:
+        dict: The result of the algorithm.
+    """
+    algorithm, multinode = schedulers[key]
+    ## Independent parts of large models are scheduled in parallel on disjoint cores if COMPONENT_WORKERS is above 1
+    if multinode:
+        return schedule_components(algorithm, application_data, platform_data, progress=progress, insertion=insertion)
+    return schedule_components(algorithm, application_data, progress=progress)
+
+
+def load_stored_model(data):
+    """
+    Load the application and platform data of a stored model referred to by a /schedule_jobs request.
+
+    The model was validated when it was stored, so only the overrides are validated here.
+
+    Args:
+        data (dict): A dictionary containing the 'model_id' and optional 'overrides'.
+
+    Raises:
+        HTTPException: 400 if the request or its overrides are malformed, 404 if the model or an overridden row does not exist.
+
+    Returns:
+        tuple: The application data and the platform data, read from the memory-mapped model.
+    """
+    try:
+        stored_model_validator.validate(data)
+    except jsonschema.exceptions.ValidationError as err:
+        print("Stored model request is invalid:", err)
+        raise HTTPException(400, "Invalid stored model request")
+
+    try:
+        stored_model = model_store.get(data["model_id"])
+    except KeyError:
+        raise HTTPException(404, "Model not found")
+
+    try:
+        return stored_model.model(data.get("overrides"))
+    except KeyError as err:
+        raise HTTPException(404, f"Overridden row {err} not found in model")
+
+
+@app.post("/models")
+def upload_model(data: dict):
+    """
+    Store a model so that /schedule_jobs requests can refer to it by id instead of sending it again.
+
+    The model is validated against the input schema and kept in a binary columnar file that is memory-mapped
+    when it is used. Uploading the same model again returns the same id. The least recently used models are
+    evicted when the store grows beyond its configured size.
+
+    Args:
+        data (dict): A dictionary containing 'application' and 'platform' data, as for /schedule_jobs.
+
+    Raises:
+        HTTPException: If the model does not match the input schema, a 400 error is raised.
+
+    Returns:
+        dict: The 'model_id' of the stored model, its 'size' in bytes and the number of rows in each table.
+    """
+    try:
+        input_validator.validate(data)
+    except jsonschema.exceptions.ValidationError as err:
+        print("Input data is invalid:", err)
+        raise HTTPException(400, "Invalid Input schema")
+
+    model_id = model_store.put(data)
+    return get_model(model_id)
+
+
+@app.get("/models/{model_id}")
+def get_model(model_id: str):
+    """
+    Retrieve information about a stored model.
+
+    Raises:
+        HTTPException: If the model does not exist, a 404 error is raised.
+
+    Returns:
+        dict: The 'model_id', its 'size' in bytes and the number of rows in each table as 'counts'.
+    """
+    try:
+        stored_model = model_store.get(model_id)
+    except KeyError:
+        raise HTTPException(404, "Model not found")
+    return {"model_id": model_id, "size": stored_model.size, "counts": stored_model.counts()}
+
+
+@app.delete("/models/{model_id}")
+def delete_model(model_id: str):
+    """
+    Delete a stored model.
+
+    Raises:
+        HTTPException: If the model does not exist, a 404 error is raised.
+
+    Returns:
+        dict: The 'model_id' of the deleted model.
+    """
+    try:
+        model_store.delete(model_id)
+    except KeyError:
+        raise HTTPException(404, "Model not found")
+    return {"model_id": model_id}
+
+
+@app.post("/verify_schedule")
+def verify_schedule(data: dict):
+    """
+    Verify a schedule against the model it was made for.
+
+    The schedule is checked for task durations, deadlines, precedence, node overlap and placement on compute
+    nodes, and optionally for communication delays between nodes, in time linear in its size.
+
+    Args:
+        data (dict): A dictionary containing the 'schedule' entries and either the 'application' and optional
+                     'platform' data, or the 'model_id' and optional 'overrides' of a stored model.
+                     'check_platform' (default true) can be set to false to verify a single-node schedule
+                     against a model with a platform, and 'check_communication' (default false) to true to
+                     also check that messages between nodes have arrived.
+
+    Raises:
+        HTTPException: If the request is malformed, a 400 error is raised. If the stored model does not exist, a 404 error is raised.
+
+    Returns:
+        dict: 'valid', which is true if no violations were found, and the list of 'violations', each with the
+              'check' that failed, the 'task_id' and a 'detail' message.
+    """
+    try:
+        verify_validator.validate(data)
+    except jsonschema.exceptions.ValidationError as err:
+        print("Verify request is invalid:", err)
+        raise HTTPException(400, "Invalid verify request")
+
+    if "model_id" in data:
+        application_data, platform_data = load_stored_model(data)
+    else:
+        application_data = data["application"]
+        platform_data = data.get("platform")
+    if not data.get("check_platform", True):
+        platform_data = None
+
+    check_communication = data.get("check_communication", False)
+    if check_communication and platform_data is None:
+        raise HTTPException(400, "Checking communication delays needs a platform")
+
+    violations = find_violations(application_data, data["schedule"], platform_data, check_communication)
+    return {"valid": not violations, "violations": violations}
+
+
 @app.get("/")
 def read_root():
     """
@@ -130,4 +673,7 @@ def read_root():
 
 
 if __name__ == "__main__":
+    # uvicorn is only needed to serve the app, so it is not imported with the module
+    import uvicorn
+
     uvicorn.run(app, host=SERVER_HOST, port=SERVER_PORT, log_level="info")
@@ -8,9 +8,49 @@ environment-specific settings that need to be centrally managed.
 The configuration settings can be easily adjusted to accommodate different deployment environments,
 such as development, testing, and production.
 
+Every setting can be overridden with an environment variable of the same name, so the same code can be
+deployed with different settings without editing this file.
+
 Attributes:
     SERVER_HOST (str): The hostname where the FastAPI server will run. Default is '127.0.0.1'.
     SERVER_PORT (int): The port on which the FastAPI server will listen. Default is 8000.
+    SERVER_WORKERS (int): Number of worker processes in production mode. Default is the number of CPUs.
+    SERVER_LOOP (str): Event loop used by the workers, 'auto', 'asyncio' or 'uvloop'. 'auto' uses uvloop when it is installed.
+    SERVER_HTTP (str): HTTP protocol implementation, 'auto', 'h11' or 'httptools'. 'auto' uses httptools when it is installed.
+    SERVER_KEEPALIVE (int): Seconds an idle keep-alive connection is held open. Default is 5.
+    SERVER_BACKLOG (int): Maximum number of pending connections. Default is 2048.
+    SERVER_LIMIT_CONCURRENCY (int): Maximum concurrent connections per worker before 503 is returned, 0 for no limit.
+    SERVER_MAX_REQUEST_SIZE (int): Maximum request body size in bytes, larger requests get a 413. Default is 16 MiB.
+    SERVER_TIMEOUT (int): Seconds a worker may stay silent before it is killed and restarted. Default is 60.
+    SERVER_GRACEFUL_TIMEOUT (int): Seconds a worker gets to finish in-flight requests on restart or shutdown. Default is 30.
+    SERVER_MAX_REQUESTS (int): Requests after which a worker is gracefully replaced, 0 to never recycle workers.
+    SERVER_MAX_REQUESTS_JITTER (int): Random extra requests added to SERVER_MAX_REQUESTS so workers do not restart together.
+    MODEL_STORE_DIR (str): Directory where uploaded models are stored. Default is 'scheduling-models' in the system's temporary directory.
+    MODEL_STORE_MAX_BYTES (int): Total size of stored models above which the least recently used are evicted. Default is 1 GiB.
+    COMPONENT_WORKERS (int): Number of processes scheduling the independent components of a model in parallel, in each
+        server worker, so SERVER_WORKERS * COMPONENT_WORKERS processes in total. Components are only scheduled in
+        parallel with more than 1, as a single process cannot be faster than the server worker itself. Default is 0,
+        scheduling every model directly: parallel scheduling changes the schedules, so only enable it where
+        benchmarks/bench_decompose.py shows a speed-up.
+    COMPONENT_MIN_TASKS (int): Number of tasks from which a model's components are scheduled in parallel. Default is 5000.
+    COST_MODEL_BASE, COST_MODEL_PER_TASK, COST_MODEL_PER_MESSAGE, COST_MODEL_PER_NODE, COST_MODEL_PER_LINK (float):
+        Coefficients in milliseconds of the linear model estimating the cost of a /schedule_jobs request from the
+        sizes of its model. Calibrate them for the deployment machine with benchmarks/calibrate_cost_model.py.
+    COST_MODEL_PER_INSERTION_TASK_CORE (float): Milliseconds added to the cost of a request with "insertion": true for
+        each task times compute core of its model, as insertion looks at every core to place a task. Calibrated with
+        the other coefficients.
+    ADMISSION_MAX_COST (float): Estimated cost in milliseconds above which requests get a 413, 0 for no budget. Default is 30000.
+    ADMISSION_QUEUE_TIMEOUT (float): Seconds a request may wait for its size class before it gets a 429. Default is 10.
+    ADMISSION_SMALL_MAX_COST, ADMISSION_MEDIUM_MAX_COST (float): Largest estimated cost in milliseconds of the small
+        and the medium requests. Default is 50 and 1000, all costlier requests are large.
+    ADMISSION_SMALL_CONCURRENCY, ADMISSION_MEDIUM_CONCURRENCY, ADMISSION_LARGE_CONCURRENCY (int): Requests of each
+        size class running at the same time in each server worker. Default is 8, 2 and 1.
+    ADMISSION_SMALL_QUEUE, ADMISSION_MEDIUM_QUEUE, ADMISSION_LARGE_QUEUE (int): Requests of each size class waiting
+        to run in each server worker, further requests get a 429. Default is 64, 8 and 2.
+    STREAM_BUFFER_SIZE (int): Events of a /schedule_jobs/stream response buffered while the client is slower than the
+        schedulers, which then wait. Default is 16.
+    STREAM_CHUNK_SIZE (int): Schedule entries after which a chunk of a streamed schedule is sent. Default is 500.
+    STREAM_CHUNK_INTERVAL (float): Seconds after which a chunk is sent even if it holds fewer entries. Default is 0.1.
 
 Example:
     Accessing configuration settings:
@@ -27,6 +67,58 @@ __author__ = "Utkarsh Raj"
 __version__ = "1.0.0"
 
 
+import os
+import tempfile
+
+
 # Define server settings
-SERVER_HOST = "127.0.0.1"  # Make 0.0.0.0 to allow access from other devices
-SERVER_PORT = 8000  # Default port for Uvicorn
+SERVER_HOST = os.environ.get("SERVER_HOST", "127.0.0.1")  # Make 0.0.0.0 to allow access from other devices
+SERVER_PORT = int(os.environ.get("SERVER_PORT", 8000))  # Default port for Uvicorn
+
+# Production server settings, used by server.py
+SERVER_WORKERS = int(os.environ.get("SERVER_WORKERS", os.cpu_count() or 1))
+SERVER_LOOP = os.environ.get("SERVER_LOOP", "auto")
+SERVER_HTTP = os.environ.get("SERVER_HTTP", "auto")
+SERVER_KEEPALIVE = int(os.environ.get("SERVER_KEEPALIVE", 5))
+SERVER_BACKLOG = int(os.environ.get("SERVER_BACKLOG", 2048))
+SERVER_LIMIT_CONCURRENCY = int(os.environ.get("SERVER_LIMIT_CONCURRENCY", 0))
+SERVER_MAX_REQUEST_SIZE = int(os.environ.get("SERVER_MAX_REQUEST_SIZE", 16 * 1024 * 1024))
+SERVER_TIMEOUT = int(os.environ.get("SERVER_TIMEOUT", 60))
+SERVER_GRACEFUL_TIMEOUT = int(os.environ.get("SERVER_GRACEFUL_TIMEOUT", 30))
+SERVER_MAX_REQUESTS = int(os.environ.get("SERVER_MAX_REQUESTS", 0))
+SERVER_MAX_REQUESTS_JITTER = int(os.environ.get("SERVER_MAX_REQUESTS_JITTER", 0))
+
+# Store for models uploaded once and reused by id, see model_store.py
+MODEL_STORE_DIR = os.environ.get("MODEL_STORE_DIR", os.path.join(tempfile.gettempdir(), "scheduling-models"))
+MODEL_STORE_MAX_BYTES = int(os.environ.get("MODEL_STORE_MAX_BYTES", 1024 * 1024 * 1024))
+
+# Parallel scheduling of independent components of a model, see decompose.py
+# Off by default, as it did not pay off in benchmarks/bench_decompose.py on the machines it was measured on
+COMPONENT_WORKERS = int(os.environ.get("COMPONENT_WORKERS", 0))
+COMPONENT_MIN_TASKS = int(os.environ.get("COMPONENT_MIN_TASKS", 5000))
+
+# Admission control of /schedule_jobs, see admission.py
+# Cost model coefficients in milliseconds, from benchmarks/calibrate_cost_model.py on a single CPU. Nodes and links
+# did not measurably add to the cost of the benchmarked models
+COST_MODEL_BASE = float(os.environ.get("COST_MODEL_BASE", 0))
+COST_MODEL_PER_TASK = float(os.environ.get("COST_MODEL_PER_TASK", 0.54))
+COST_MODEL_PER_MESSAGE = float(os.environ.get("COST_MODEL_PER_MESSAGE", 0.045))
+COST_MODEL_PER_NODE = float(os.environ.get("COST_MODEL_PER_NODE", 0))
+COST_MODEL_PER_LINK = float(os.environ.get("COST_MODEL_PER_LINK", 0))
+# Requests with insertion took up to 650 ms longer for 8000 tasks on 32 nodes with 52 cores
+COST_MODEL_PER_INSERTION_TASK_CORE = float(os.environ.get("COST_MODEL_PER_INSERTION_TASK_CORE", 0.0014))
+ADMISSION_MAX_COST = float(os.environ.get("ADMISSION_MAX_COST", 30000))
+ADMISSION_QUEUE_TIMEOUT = float(os.environ.get("ADMISSION_QUEUE_TIMEOUT", 10))
+ADMISSION_SMALL_MAX_COST = float(os.environ.get("ADMISSION_SMALL_MAX_COST", 50))
+ADMISSION_MEDIUM_MAX_COST = float(os.environ.get("ADMISSION_MEDIUM_MAX_COST", 1000))
+ADMISSION_SMALL_CONCURRENCY = int(os.environ.get("ADMISSION_SMALL_CONCURRENCY", 8))
+ADMISSION_MEDIUM_CONCURRENCY = int(os.environ.get("ADMISSION_MEDIUM_CONCURRENCY", 2))
+ADMISSION_LARGE_CONCURRENCY = int(os.environ.get("ADMISSION_LARGE_CONCURRENCY", 1))
+ADMISSION_SMALL_QUEUE = int(os.environ.get("ADMISSION_SMALL_QUEUE", 64))
+ADMISSION_MEDIUM_QUEUE = int(os.environ.get("ADMISSION_MEDIUM_QUEUE", 8))
+ADMISSION_LARGE_QUEUE = int(os.environ.get("ADMISSION_LARGE_QUEUE", 2))
+
+# Streaming of schedules by /schedule_jobs/stream, see streaming.py
+STREAM_BUFFER_SIZE = int(os.environ.get("STREAM_BUFFER_SIZE", 16))
+STREAM_CHUNK_SIZE = int(os.environ.get("STREAM_CHUNK_SIZE", 500))
+STREAM_CHUNK_INTERVAL = float(os.environ.get("STREAM_CHUNK_INTERVAL", 0.1))
@@ -0,0 +1,218 @@
+"""
+This module schedules the independent parts of an application model in parallel.
+
+Application models often contain several pipelines that share no messages. When a large model is scheduled in
+parallel, the weakly connected components of its task graph are shared out between a few groups and every group
+is given its own cores of the platform. Each group is scheduled by the algorithm on its cores alone, in a worker
+process. As the groups use disjoint cores, their schedules are put together as they are, without placing any
+task again, so merging costs no more than joining the lists of entries.
+
+Components are assigned to groups largest first, each to the group with the least work, and the cores fastest
+first, each to the group with the most work per unit of speed, so every group gets capacity in proportion to its
+work. A group keeps the tasks of its components in the order of the task list, so the algorithm considers them in
+the same order as for the whole model. The schedules still differ from scheduling the whole model, as a group
+cannot use the idle cores of another group, and depend on the number of workers. Parallel scheduling is
+therefore off unless COMPONENT_WORKERS is set above 1, which should only be done where
+benchmarks/bench_decompose.py shows a speed-up on the deployment machine.
+
+The single-node algorithms have a single core to share, so they always schedule the whole model.
+
+Functions:
+- split_application: Splits an application model into its independent components.
+- partition: Shares out the components of a model and the cores of a platform between groups.
+- merge_schedules: Puts together the schedules of groups scheduled on disjoint cores.
+- schedule_components: Schedules the groups of a model with an algorithm in parallel and merges the results.
+"""
+
+__version__ = "1.0.0"
+
+
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import heapq
+import multiprocessing
+import threading
+
+from config import COMPONENT_WORKERS, COMPONENT_MIN_TASKS
+from task_graph import TaskGraph
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    # The pool is created on first use, so each server worker forked from a preloaded app gets its own
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Spawned rather than forked processes, as forking a server with running threads is unsafe
+            _executor = ProcessPoolExecutor(max(1, COMPONENT_WORKERS), mp_context=multiprocessing.get_context("spawn"))
+        return _executor
+
+
+def _component_of(application_data):
+    # Map every task id to the index of its weakly connected component
+    graph = TaskGraph.from_application(application_data)
+    component_of = {}
+    for index, component in enumerate(graph.weakly_connected_components()):
+        for task_id in component:
+            component_of[task_id] = index
+    return component_of
+
+
+def _group_application(application_data, group_of):
+    # Split the tasks and messages of an application by the group of their component, keeping their relative order.
+    # Rows of a stored model are copied into dictionaries, so the parts can be sent to other processes
+    parts = defaultdict(lambda: {"tasks": [], "messages": []})
+    for task in application_data["tasks"]:
+        parts[group_of[task["id"]]]["tasks"].append(task if type(task) is dict else dict(task))
+    for message in application_data["messages"]:
+        parts[group_of[message["sender"]]]["messages"].append(message if type(message) is dict else dict(message))
+    return parts
+
+
+def split_application(application_data):
+    """
+    Split an application model into its weakly connected components.
+
+    Args:
+        application_data (dict): Application model with 'tasks' and 'messages'.
+
+    Returns:
+        list: One application model per component. Tasks and messages keep their relative order.
+    """
+    parts = _group_application(application_data, _component_of(application_data))
+    # Components made only of tasks referred to by messages but missing from the model have no tasks and are dropped
+    return [parts[index] for index in sorted(parts) if parts[index]["tasks"]]
+
+
+def partition(application_data, platform_data, max_groups=None):
+    """
+    Share out the components of an application and the cores of a platform between groups.
+
+    Args:
+        application_data (dict): Application model with 'tasks' and 'messages'.
+        platform_data (dict): The platform model.
+        max_groups (int): Largest number of groups. By default there are as many as components or compute cores.
+
+    Returns:
+        list: The (application_data, platform_data) of each group. Every component is in one group and every
+              compute core in one group's platform, whose nodes keep their ids with fewer cores. A single group
+              holds the whole model unchanged.
+    """
+    component_of = _component_of(application_data)
+    work = defaultdict(int)
+    for task in application_data["tasks"]:
+        work[component_of[task["id"]]] += task["wcet"]
+    # One entry (speed, position, node) per compute core
+    cores = [
+        (node.get("speed", 1), position, node)
+        for position, node in enumerate(platform_data["nodes"])
+        if node["type"] == "compute"
+        for _ in range(node.get("cores", 1))
+    ]
+    count = min(len(work), len(cores), max_groups or len(cores))
+    if count <= 1:
+        return [(application_data, platform_data)]
+
+    # Components largest first, each to the group with the least work so far
+    loads = [(0, group) for group in range(count)]
+    group_of_component = {}
+    group_work = [0] * count
+    for component in sorted(work, key=lambda component: -work[component]):
+        load, group = heapq.heappop(loads)
+        group_of_component[component] = group
+        group_work[group] += work[component]
+        heapq.heappush(loads, (load + work[component], group))
+
+    # Cores fastest first: one to each group, the busiest groups first, then each to the group with the most work
+    # per unit of speed
+    cores.sort(key=lambda core: (-core[0], core[1]))
+    group_cores = [[] for _ in range(count)]
+    capacity = [0] * count
+    for group, core in zip(sorted(range(count), key=lambda group: -group_work[group]), cores):
+        group_cores[group].append(core)
+        capacity[group] += core[0]
+    pressure = [(-group_work[group] / capacity[group], group) for group in range(count)]
+    heapq.heapify(pressure)
+    for core in cores[count:]:
+        _, group = heapq.heappop(pressure)
+        group_cores[group].append(core)
+        capacity[group] += core[0]
+        heapq.heappush(pressure, (-group_work[group] / capacity[group], group))
+
+    links = [dict(link) for link in platform_data.get("links", [])]
+    parts = _group_application(application_data, {task_id: group_of_component.get(component) for task_id, component in component_of.items()})
+    groups = []
+    for group in range(count):
+        # The nodes of the group in node list order, each with the number of its cores the group was given
+        core_counts = defaultdict(int)
+        nodes = {}
+        for _, position, node in group_cores[group]:
+            core_counts[position] += 1
+            nodes[position] = node
+        group_nodes = [dict(nodes[position], cores=core_counts[position]) for position in sorted(nodes)]
+        groups.append((parts[group], {"nodes": group_nodes, "links": links}))
+    return groups
+
+
+def merge_schedules(results):
+    """
+    Put together the schedules of groups that were scheduled on disjoint cores.
+
+    No two groups share a core, so every entry keeps the placement its group's schedule gave it.
+
+    Args:
+        results (list): The result of the scheduling algorithm for each group, in group order.
+
+    Returns:
+        dict: The result of the first group, with the entries of all groups in group order.
+    """
+    return dict(results[0], schedule=[entry for result in results for entry in result["schedule"]])
+
+
+def _schedule(algorithm, application_data, platform_data, options):
+    if platform_data is None:
+        return algorithm(application_data, **options)
+    return algorithm(application_data, platform_data, **options)
+
+
+def schedule_components(algorithm, application_data, platform_data=None, parallel=None, progress=None, **options):
+    """
+    Schedule the independent components of an application in groups on worker processes and merge the results.
+
+    Models that are not scheduled in parallel, single-node schedules and models with a single component or a
+    single compute core are scheduled directly, giving the same result as calling the algorithm.
+
+    Args:
+        algorithm (function): A scheduling algorithm from the algorithms module.
+        application_data (dict): Application model with 'tasks' and 'messages'.
+        platform_data (dict): The platform model for multi-node algorithms, None for single-node algorithms.
+        parallel (bool): Schedule the components on worker processes. By default they are when the model has at
+                         least COMPONENT_MIN_TASKS tasks and COMPONENT_WORKERS is above 1.
+        progress (function): Called with each entry of the final schedule, or None for a dropped task. Entries of
+                             models scheduled in parallel are reported a group at a time, as each group finishes.
+        **options: Further keyword arguments for the algorithm, e.g. insertion=True.
+
+    Returns:
+        dict: The result of the algorithm, with the merged schedule.
+    """
+    if parallel is None:
+        parallel = COMPONENT_WORKERS > 1 and len(application_data["tasks"]) >= COMPONENT_MIN_TASKS
+    groups = []
+    if parallel and platform_data is not None and application_data["tasks"]:
+        # No more groups than workers, as further groups would not run sooner but could share fewer cores
+        groups = partition(application_data, platform_data, max(2, COMPONENT_WORKERS))
+    if len(groups) <= 1:
+        if progress is not None:
+            options = dict(options, progress=progress)
+        return _schedule(algorithm, application_data, platform_data, options)
+
+    executor = _get_executor()
+    futures = [executor.submit(_schedule, algorithm, group_application, group_platform, options) for group_application, group_platform in groups]
+    if progress is not None:
+        for future in as_completed(futures):
+            for entry in future.result()["schedule"]:
+                progress(entry)
+    return merge_schedules([future.result() for future in futures])
@@ -0,0 +1,509 @@
+"""
+This module contains the on-disk store for application and platform models that are reused between requests.
+
+A model is uploaded once, converted to a compact binary columnar file and memory-mapped when it is used. Later
+requests refer to it by id, so the model is neither uploaded nor parsed again, and every worker process reading
+the same model shares its pages through the operating system's page cache.
+
+File format (all numbers in the byte order recorded in the header):
+
+- 8 bytes magic `SCHMODL1`, followed by the length of the header as an unsigned 64-bit integer.
+- A JSON header describing each table (tasks, messages, nodes, links): its row count and, for each column,
+  its type, offset and length in bytes.
+- The column data, each column aligned to 8 bytes. Column types are:
+    - 'q': 64-bit signed integers.
+    - 'd': 64-bit floats, used for numeric columns that are not all integers.
+    Integers that do not fit in 64 bits, which JSON and the input schema allow, make their column a 'j' column,
+    so they are stored exactly.
+    - 's': strings, stored as 32-bit indices into the file's string table.
+    - 'j': any other values (e.g. a column mixing strings and integers), stored as JSON strings in the string table.
+  A column that is missing from some rows also has a one byte per row validity mask.
+
+Tables are read through `ColumnTable`, which behaves like a list of dictionaries but reads each value directly
+from the mapped columns. The schedulers work on plain dictionaries and read every value, so `StoredModel.model`
+materialises the tables into dictionaries column by column, on every request. That costs about as much as
+parsing the model from JSON (see benchmarks/bench_model_store.py), so the store saves uploading and validating a
+model again, not the work of reading it: scheduling a stored model is not zero-copy.
+
+Classes:
+- ColumnTable: Read-only sequence of rows backed by the columns of one table.
+- StoredModel: A memory-mapped model file.
+- ModelStore: Directory of model files, evicting the least recently used ones when it grows too large.
+"""
+
+__version__ = "1.0.0"
+
+
+from array import array
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+
+
+MAGIC = b"SCHMODL1"
+PREFIX = struct.Struct("<8sQ")
+FILE_SUFFIX = ".model"
+# The tables stored for each part of a model
+MODEL_TABLES = {
+    "application": ("tasks", "messages"),
+    "platform": ("nodes", "links"),
+}
+# Range of the 'q' column type
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def _column_type(values):
+    # bool is a subclass of int, but must round-trip as JSON true/false
+    if all(type(value) is int for value in values):
+        if all(_INT64_MIN <= value <= _INT64_MAX for value in values):
+            return "q"
+        # Larger integers would overflow a 'q' column and lose precision in a 'd' column
+        return "j"
+    if all(type(value) in (int, float) for value in values):
+        if any(type(value) is int and not _INT64_MIN <= value <= _INT64_MAX for value in values):
+            return "j"
+        return "d"
+    if all(type(value) is str for value in values):
+        return "s"
+    return "j"
+
+
+def encode_model(model):
+    """
+    Encode a model into the binary columnar format.
+
+    Args:
+        model (dict): A model with 'application' and 'platform' data, as accepted by /schedule_jobs.
+
+    Returns:
+        bytes: The encoded model file.
+    """
+    strings = {}
+    chunks = []
+    offset = 0
+    header = {"byteorder": sys.byteorder, "tables": {}}
+
+    def add_chunk(data):
+        nonlocal offset
+        padding = _align(offset) - offset
+        if padding:
+            chunks.append(b"\0" * padding)
+            offset += padding
+        chunks.append(data)
+        start = offset
+        offset += len(data)
+        return [start, len(data)]
+
+    def string_index(value):
+        return strings.setdefault(value, len(strings))
+
+    for part, table_names in MODEL_TABLES.items():
+        for table_name in table_names:
+            rows = model[part].get(table_name, [])
+            columns = {}
+            # Keep the keys in the order they first appear so rows read back with the same key order
+            keys = list(dict.fromkeys(key for row in rows for key in row))
+            for key in keys:
+                present = [key in row for row in rows]
+                values = [row[key] for row in rows if key in row]
+                column_type = _column_type(values)
+                if column_type == "q":
+                    data = array("q", (row.get(key, 0) for row in rows))
+                elif column_type == "d":
+                    data = array("d", (row.get(key, 0) for row in rows))
+                elif column_type == "s":
+                    data = array("i", (string_index(row.get(key, "")) for row in rows))
+                else:
+                    data = array("i", (string_index(json.dumps(row.get(key))) for row in rows))
+                column = {"type": column_type, "data": add_chunk(data.tobytes())}
+                if not all(present):
+                    column["mask"] = add_chunk(bytes(present))
+                columns[key] = column
+            header["tables"][table_name] = {"rows": len(rows), "columns": columns}
+
+    encoded_strings = [value.encode() for value in strings]
+    string_offsets = array("q", [0])
+    for value in encoded_strings:
+        string_offsets.append(string_offsets[-1] + len(value))
+    header["strings"] = {
+        "count": len(encoded_strings),
+        "offsets": add_chunk(string_offsets.tobytes()),
+        "data": add_chunk(b"".join(encoded_strings)),
+    }
+
+    header_bytes = json.dumps(header, separators=(",", ":")).encode()
+    # Data offsets are relative to the end of the header, which is padded to keep the columns aligned
+    header_end = _align(PREFIX.size + len(header_bytes))
+    prefix = PREFIX.pack(MAGIC, len(header_bytes)) + header_bytes
+    return prefix + b"\0" * (header_end - len(prefix)) + b"".join(chunks)
+
+
+# Marks the values of rows missing from a masked column
+_MISSING = object()
+
+
+class _Row(Mapping):
+    """One row of a ColumnTable, read lazily from its columns."""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, key):
+        return self._table._value(self._index, key)
+
+    def __iter__(self):
+        return iter(self._table._row_keys(self._index))
+
+    def __len__(self):
+        return len(self._table._row_keys(self._index))
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class ColumnTable(Sequence):
+    """
+    Read-only table of rows backed by memory-mapped columns.
+
+    Rows behave like read-only dictionaries. Values are read from the columns on access, so iterating over a table
+    does not copy or parse it. Individual rows can be overridden to change a few parameters of a stored model.
+    """
+
+    def __init__(self, columns, rows, strings, overrides=None):
+        self._columns = columns
+        self._rows = rows
+        self._strings = strings
+        self._overrides = overrides or {}
+
+    def __len__(self):
+        return self._rows
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._rows))]
+        if index < 0:
+            index += self._rows
+        if not 0 <= index < self._rows:
+            raise IndexError("table index out of range")
+        return _Row(self, index)
+
+    def column(self, key):
+        """
+        Return a column as a zero-copy memoryview of integers or floats.
+
+        Raises:
+            KeyError: If the table has no such column.
+            TypeError: If the column does not hold numbers.
+        """
+        column_type, data, _ = self._columns[key]
+        if column_type not in ("q", "d"):
+            raise TypeError(f"Column {key!r} does not hold numbers.")
+        return data
+
+    def _value(self, index, key):
+        override = self._overrides.get(index)
+        if override is not None and key in override:
+            return override[key]
+        column_type, data, mask = self._columns[key]
+        if mask is not None and not mask[index]:
+            raise KeyError(key)
+        if column_type == "q" or column_type == "d":
+            return data[index]
+        if column_type == "s":
+            return self._strings(data[index])
+        return json.loads(self._strings(data[index]))
+
+    def rows(self):
+        """
+        Materialise the table as a list of plain dictionaries, with the overrides applied.
+
+        Every value read through a row of the table goes through several Python calls, so algorithms reading all
+        fields of all rows run faster on dictionaries. They are built column by column, converting each column
+        to Python values in one pass.
+
+        Returns:
+            list: One dictionary per row, as in the uploaded model.
+        """
+        keys = list(self._columns)
+        columns = []
+        masked = False
+        for key in keys:
+            column_type, data, mask = self._columns[key]
+            values = data.tolist()
+            valid = mask.tolist() if mask is not None else [True] * len(values)
+            if column_type == "s":
+                values = [self._strings(value) if ok else None for value, ok in zip(values, valid)]
+            elif column_type == "j":
+                values = [json.loads(self._strings(value)) if ok else None for value, ok in zip(values, valid)]
+            if mask is not None:
+                masked = True
+                values = [value if ok else _MISSING for value, ok in zip(values, valid)]
+            columns.append(values)
+
+        if masked:
+            rows = [{key: value for key, value in zip(keys, row) if value is not _MISSING} for row in zip(*columns)]
+        else:
+            rows = [dict(zip(keys, row)) for row in zip(*columns)]
+        for index, override in self._overrides.items():
+            rows[index].update(override)
+        return rows
+
+    def _row_keys(self, index):
+        keys = [key for key, (_, _, mask) in self._columns.items() if mask is None or mask[index]]
+        override = self._overrides.get(index)
+        if override is not None:
+            keys.extend(key for key in override if key not in self._columns)
+        return keys
+
+    def with_overrides(self, overrides):
+        """
+        Return a view of this table with some rows changed, without copying the columns.
+
+        Args:
+            overrides (list): Partial rows, each with the 'id' of the row it changes and the fields to change.
+
+        Raises:
+            KeyError: If an override refers to an id that is not in the table.
+
+        Returns:
+            ColumnTable: The table with the overrides applied on top of any existing ones.
+        """
+        ids = self.column("id")
+        positions = {row_id: index for index, row_id in enumerate(ids)}
+        merged = {index: dict(fields) for index, fields in self._overrides.items()}
+        for override in overrides:
+            index = positions[override["id"]]
+            merged.setdefault(index, {}).update(override)
+        return ColumnTable(self._columns, self._rows, self._strings, merged)
+
+
+class StoredModel:
+    """
+    A model file mapped into memory.
+
+    Attributes:
+        model_id (str): The id of the model.
+        size (int): Size of the model file in bytes.
+        tables (dict): Maps each table name to its ColumnTable.
+    """
+
+    def __init__(self, model_id, path):
+        self.model_id = model_id
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.size = len(self._mmap)
+        buffer = memoryview(self._mmap)
+
+        magic, header_length = PREFIX.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a model file.")
+        header = json.loads(bytes(buffer[PREFIX.size:PREFIX.size + header_length]))
+        data_start = _align(PREFIX.size + header_length)
+        swap = header["byteorder"] != sys.byteorder
+
+        def view(location, typecode):
+            start, length = location
+            chunk = buffer[data_start + start:data_start + start + length]
+            if not swap:
+                return chunk.cast(typecode)
+            # A file written on a machine of the other byte order is converted once instead of mapped
+            values = array(typecode, chunk.tobytes())
+            values.byteswap()
+            return memoryview(values)
+
+        string_offsets = view(header["strings"]["offsets"], "q")
+        string_data = view(header["strings"]["data"], "B")
+        string_cache = {}
+
+        def strings(index):
+            value = string_cache.get(index)
+            if value is None:
+                value = string_cache[index] = str(string_data[string_offsets[index]:string_offsets[index + 1]], "utf-8")
+            return value
+
+        self.tables = {}
+        for table_name, table in header["tables"].items():
+            columns = {}
+            for key, column in table["columns"].items():
+                typecode = {"q": "q", "d": "d", "s": "i", "j": "i"}[column["type"]]
+                mask = view(column["mask"], "B") if "mask" in column else None
+                columns[key] = (column["type"], view(column["data"], typecode), mask)
+            self.tables[table_name] = ColumnTable(columns, table["rows"], strings)
+
+    def counts(self):
+        """Return the number of rows in each table."""
+        return {table_name: len(table) for table_name, table in self.tables.items()}
+
+    def model(self, overrides=None):
+        """
+        Return the application and platform data of the model, in the form the scheduling algorithms take.
+
+        The tables are materialised as lists of dictionaries once per call, as the algorithms read every field
+        of every row. Use `tables` to read single values without materialising the tables.
+
+        Args:
+            overrides (dict): Optional partial rows by table name, e.g. {"tasks": [{"id": 3, "deadline": 500}]}.
+
+        Raises:
+            KeyError: If an override refers to an unknown table or row id.
+
+        Returns:
+            tuple: The application data and the platform data.
+        """
+        tables = dict(self.tables)
+        for table_name, table_overrides in (overrides or {}).items():
+            tables[table_name] = tables[table_name].with_overrides(table_overrides)
+        application_data, platform_data = (
+            {table_name: tables[table_name].rows() for table_name in table_names} for table_names in MODEL_TABLES.values()
+        )
+        return application_data, platform_data
+
+
+class ModelStore:
+    """
+    Directory of stored models, shared by all worker processes of the server.
+
+    Model ids are derived from the content of the model, so uploading the same model again returns the same id
+    without writing it. The modification time of each file records when it was last used, and the least recently
+    used models are deleted once the files together exceed max_bytes.
+    """
+
+    def __init__(self, directory, max_bytes, max_open=64):
+        """
+        Args:
+            directory (str): Directory the model files are kept in. It is created if it does not exist.
+            max_bytes (int): Total size of the model files above which the least recently used are evicted.
+            max_open (int): Number of models this process keeps mapped between requests.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_open = max_open
+        self._open = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, model_id):
+        # Ids are hex digests, anything else could point outside the store
+        if not model_id or not all(c in "0123456789abcdef" for c in model_id):
+            raise KeyError(model_id)
+        return os.path.join(self.directory, model_id + FILE_SUFFIX)
+
+    def put(self, model):
+        """
+        Store a model.
+
+        Args:
+            model (dict): A validated model with 'application' and 'platform' data.
+
+        Returns:
+            str: The id to refer to the model by.
+        """
+        # Only the stored parts of the model make up its id, not e.g. scheduling options sent with it
+        stored_parts = {part: model[part] for part in MODEL_TABLES}
+        canonical = json.dumps(stored_parts, sort_keys=True, separators=(",", ":")).encode()
+        model_id = hashlib.sha256(canonical).hexdigest()[:32]
+        path = self._path(model_id)
+        if os.path.exists(path):
+            os.utime(path)
+            return model_id
+
+        # Write to a temporary file first, so other workers never see a partly written model
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(encode_model(model))
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self.evict(keep=model_id)
+        return model_id
+
+    def get(self, model_id):
+        """
+        Map a stored model.
+
+        Raises:
+            KeyError: If no model with this id is stored.
+
+        Returns:
+            StoredModel: The mapped model.
+        """
+        path = self._path(model_id)
+        with self._lock:
+            stored = self._open.get(model_id)
+            if stored is not None:
+                self._open.move_to_end(model_id)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted, possibly by another worker; a model that is still mapped here stays readable
+            with self._lock:
+                self._open.pop(model_id, None)
+            raise KeyError(model_id) from None
+        if stored is None:
+            stored = StoredModel(model_id, path)
+            with self._lock:
+                self._open[model_id] = stored
+                while len(self._open) > self.max_open:
+                    # Requests still using an unmapped model keep it alive until they finish
+                    self._open.popitem(last=False)
+        return stored
+
+    def delete(self, model_id):
+        """
+        Delete a stored model.
+
+        Raises:
+            KeyError: If no model with this id is stored.
+        """
+        path = self._path(model_id)
+        with self._lock:
+            self._open.pop(model_id, None)
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            raise KeyError(model_id) from None
+
+    def evict(self, keep=None):
+        """
+        Delete the least recently used models until the store is no larger than max_bytes.
+
+        Args:
+            keep (str): Id of a model that must not be evicted, e.g. the one just stored.
+        """
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(FILE_SUFFIX):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.name[: -len(FILE_SUFFIX)]))
+        total = sum(size for _, size, _ in files)
+        for _, size, model_id in sorted(files):
+            if total <= self.max_bytes:
+                break
+            if model_id == keep:
+                continue
+            try:
+                self.delete(model_id)
+            except (KeyError, OSError):
+                # Already deleted by another worker, or still mapped on a platform that cannot delete it
+                continue
+            total -= size
@@ -0,0 +1,417 @@
+"""
+This module contains the pool of compute nodes that the multi-node scheduling algorithms place tasks on.
+
+Nodes may differ in speed and number of cores. A node with `speed` s runs a task in ceil(wcet / s) time units
+and a node with `cores` c can run c tasks at the same time. Both are optional and default to 1.
+
+By default tasks are appended after the last task on a core. With insertion, as in HEFT, a task may also be placed
+in an idle gap between earlier tasks, e.g. one left while a core waited for the predecessors of its next task.
+
+Classes:
+- IntervalIndex: Idle gaps between the busy intervals of one core, to find the earliest gap a task fits in.
+- NodePool: Tracks when every core of every compute node becomes free and picks the core that finishes a task earliest.
+
+Functions:
+- execution_time: Time a task takes on a node of a given speed.
+"""
+
+__version__ = "1.0.0"
+
+
+import heapq
+import math
+import random
+
+
+def execution_time(wcet, speed=1):
+    """
+    Compute how long a task runs on a node of the given speed.
+
+    Args:
+        wcet (int): Worst case execution time of the task on a node of speed 1.
+        speed (float): Relative speed of the node.
+
+    Returns:
+        int: The execution time, rounded up so schedules keep integer times.
+    """
+    if speed == 1:
+        return wcet
+    return math.ceil(wcet / speed)
+
+
+class _Gap:
+    """An idle gap of a core, as a node of a treap ordered by start time."""
+
+    __slots__ = ("start", "end", "priority", "left", "right", "longest")
+
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+        self.priority = random.random()
+        self.left = None
+        self.right = None
+        # The longest gap in the subtree of this node
+        self.longest = end - start
+
+
+def _update(gap):
+    longest = gap.end - gap.start
+    if gap.left is not None and gap.left.longest > longest:
+        longest = gap.left.longest
+    if gap.right is not None and gap.right.longest > longest:
+        longest = gap.right.longest
+    gap.longest = longest
+
+
+def _split(gap, key):
+    # Split a treap into the gaps that start before key and the gaps that start at or after it
+    if gap is None:
+        return None, None
+    if gap.start < key:
+        gap.right, right = _split(gap.right, key)
+        _update(gap)
+        return gap, right
+    left, gap.left = _split(gap.left, key)
+    _update(gap)
+    return left, gap
+
+
+def _merge(left, right):
+    # Join two treaps, where every gap of left starts before every gap of right
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
+
+
+def _first_fit(gap, after, duration):
+    # The first gap that starts after the given time and is at least duration long. Subtrees without a gap that
+    # long are skipped, so only the search path of the given time and one path down are visited
+    if gap is None or gap.longest < duration:
+        return None
+    if gap.start > after:
+        found = _first_fit(gap.left, after, duration)
+        if found is not None:
+            return found
+        if gap.end - gap.start >= duration:
+            return gap
+    return _first_fit(gap.right, after, duration)
+
+
+class IntervalIndex:
+    """
+    The busy intervals of one core, kept as the idle gaps between them.
+
+    The gaps before the end of the last interval are held in a treap ordered by start time, in which every node
+    also records the longest gap below it. The gap at a given time is found in O(log n), and so is the first later
+    gap long enough for a task, as subtrees without one are skipped. Adding an interval shrinks or splits a single
+    gap in O(log n). Touching intervals leave no gap between them, so back-to-back tasks, the common case, do not
+    grow the index.
+    """
+
+    def __init__(self):
+        self._root = None
+        self._end = 0
+        self._count = 0
+
+    def __len__(self):
+        """Return the number of busy intervals, with touching intervals counted as one."""
+        return self._count
+
+    def end(self):
+        """Return the time the last interval ends, 0 if there is none."""
+        return self._end
+
+    def longest_gap(self):
+        """Return the length of the longest gap before the last interval, -1 if there is none."""
+        return self._root.longest if self._root is not None else -1
+
+    def last_gap_end(self):
+        """Return the time the latest gap before the last interval ends, -1 if there is none."""
+        gap = self._root
+        if gap is None:
+            return -1
+        while gap.right is not None:
+            gap = gap.right
+        return gap.end
+
+    def _gap_at(self, time):
+        # The gap with the latest start at or before time, if any
+        gap = self._root
+        found = None
+        while gap is not None:
+            if gap.start <= time:
+                found = gap
+                gap = gap.right
+            else:
+                gap = gap.left
+        return found
+
+    def earliest_start(self, ready_time, duration):
+        """
+        Find the earliest time a task can start in a gap, or after the last interval.
+
+        Args:
+            ready_time (int): Earliest time the task may start.
+            duration (int): How long the task runs.
+
+        Returns:
+            int: The earliest start time at or after ready_time at which the core is idle for duration.
+        """
+        if ready_time >= self._end:
+            return ready_time
+        # The task starts at its ready time if the gap it falls in is long enough. Before the first gap there is
+        # only room for a task of no duration, at time 0 where the first interval starts
+        gap = self._gap_at(ready_time)
+        if (gap.end if gap is not None else 0) - ready_time >= duration:
+            return ready_time
+        gap = _first_fit(self._root, ready_time, duration)
+        return gap.start if gap is not None else self._end
+
+    def add(self, start_time, end_time):
+        """Mark the core busy from start_time to end_time. The interval must lie in a gap."""
+        if start_time == end_time:
+            return
+        if start_time >= self._end:
+            merge_previous = start_time == self._end and self._count > 0
+            if start_time > self._end:
+                self._root = _merge(self._root, _Gap(self._end, start_time))
+            self._end = end_time
+            self._count += 0 if merge_previous else 1
+            return
+
+        gap = self._gap_at(start_time)
+        left, right = _split(self._root, gap.start)
+        # Gaps are disjoint, so the gap is the only one starting before its own end
+        _, right = _split(right, gap.end)
+        if start_time > gap.start:
+            left = _merge(left, _Gap(gap.start, start_time))
+        if end_time < gap.end:
+            right = _merge(_Gap(end_time, gap.end), right)
+        self._root = _merge(left, right)
+        # A gap starting at 0 is the one before the first interval, every other gap follows an interval
+        merge_previous = start_time == gap.start and gap.start != 0
+        merge_next = end_time == gap.end
+        self._count += 1 - merge_previous - merge_next
+
+
+class _CoreIndex:
+    """
+    The IntervalIndex of every core of a speed group, with a segment tree over them to skip cores quickly.
+
+    For every subtree of cores, the tree keeps the earliest time one of them ends its last interval, the longest
+    gap on any of them and the latest time any of their gaps ends. A subtree whose gaps are all too short, or all
+    end too early, cannot fit the task in a gap, so its best start comes from its last intervals in O(log C)
+    without visiting its cores.
+    """
+
+    def __init__(self, cores):
+        """
+        Args:
+            cores (list): (position, core, node_id) of each core, in node list order.
+        """
+        self.cores = cores
+        self.intervals = [IntervalIndex() for _ in cores]
+        size = 1
+        while size < len(cores):
+            size *= 2
+        self._size = size
+        # Leaves are at size + i, unused leaves never end and have no gaps
+        self._ends = [math.inf] * (2 * size)
+        self._longest = [-1] * (2 * size)
+        self._gap_ends = [-1] * (2 * size)
+        for i in range(len(cores)):
+            self._ends[size + i] = 0
+        for node in range(size - 1, 0, -1):
+            self._ends[node] = min(self._ends[2 * node], self._ends[2 * node + 1])
+
+    def add(self, i, start_time, end_time):
+        """Mark core i busy from start_time to end_time."""
+        intervals = self.intervals[i]
+        intervals.add(start_time, end_time)
+        node = self._size + i
+        self._ends[node] = intervals.end()
+        self._longest[node] = intervals.longest_gap()
+        self._gap_ends[node] = intervals.last_gap_end()
+        node //= 2
+        while node:
+            left, right = 2 * node, 2 * node + 1
+            self._ends[node] = min(self._ends[left], self._ends[right])
+            self._longest[node] = max(self._longest[left], self._longest[right])
+            self._gap_ends[node] = max(self._gap_ends[left], self._gap_ends[right])
+            node //= 2
+
+    def earliest_start(self, ready_time, duration):
+        """
+        Find the core of the group that can start a task first, the first such core in node list order on ties.
+
+        Returns:
+            tuple: (start_time, i) of the best core i, or (inf, None) if the group has no cores.
+        """
+        best_start = math.inf
+        best = None
+        # Subtrees are visited from left to right, so a later core only wins by starting strictly earlier
+        stack = [1]
+        while stack:
+            node = stack.pop()
+            if best_start == ready_time:
+                # No core can start before the ready time
+                break
+            # A task of no duration can also start where an interval starts, so its cores are not ruled out
+            if duration > 0 and (self._longest[node] < duration or self._gap_ends[node] < ready_time + duration):
+                # No gap below can take the task, so every core there starts it after its last interval
+                start_time = max(ready_time, self._ends[node])
+                if start_time < best_start:
+                    best_start = start_time
+                    best = self._first_ending_by(node, start_time)
+            elif node >= self._size:
+                i = node - self._size
+                if i >= len(self.intervals):
+                    # Unused leaves pad the tree to a power of two
+                    continue
+                start_time = self.intervals[i].earliest_start(ready_time, duration)
+                if start_time < best_start:
+                    best_start = start_time
+                    best = i
+            else:
+                stack.append(2 * node + 1)
+                stack.append(2 * node)
+        return best_start, best
+
+    def _first_ending_by(self, node, time):
+        # The first core below node whose last interval ends by the given time
+        while node < self._size:
+            node = 2 * node if self._ends[2 * node] <= time else 2 * node + 1
+        return node - self._size
+
+
+class NodePool:
+    """
+    Availability of the cores of all compute nodes on a platform.
+
+    Cores are grouped by node speed and each group is kept in a heap ordered by the time the core becomes free.
+    Within a group the core that is free first always finishes a task first, so finding the earliest finish time
+    only looks at the top of each heap. A decision costs O(S + log C) for S distinct speeds and C cores, rather than
+    O(C) for scanning every node.
+
+    Ties are broken by the position of the node in the platform's node list, so on a platform of identical
+    single-core nodes this picks the same node as choosing the node that is free first.
+
+    With insertion, every core keeps an IntervalIndex instead, finding its earliest fitting gap in O(log n) for n
+    intervals. A gap can open on any core, so each group also keeps a segment tree over its cores with their
+    longest gaps and latest gap ends, and only the cores that have a gap that may fit the task are searched. The
+    others are ruled out together in O(log C) by when they end their last interval. The search stops within a
+    group once a core can start the task at its ready time, and skips a group when even starting at the ready
+    time would not beat the best placement found.
+
+    Attributes:
+        speeds (dict): Maps each compute node id to its speed.
+        cores (dict): Maps each compute node id to its number of cores.
+    """
+
+    def __init__(self, nodes, compute_only=True, insertion=False):
+        """
+        Args:
+            nodes (list): The 'nodes' of a platform model.
+            compute_only (bool): Only use nodes of type 'compute'. When False every node is used.
+            insertion (bool): Allow tasks to be placed in idle gaps between earlier tasks.
+        """
+        self.speeds = {}
+        self.cores = {}
+        self.insertion = insertion
+        self._groups = {}
+        self._group_cores = {}
+        for position, node in enumerate(nodes):
+            if compute_only and node["type"] != "compute":
+                continue
+            speed = node.get("speed", 1)
+            cores = node.get("cores", 1)
+            self.speeds[node["id"]] = speed
+            self.cores[node["id"]] = cores
+            # Entries are (available_time, position, core, node_id); a sorted list is already a valid heap
+            self._groups.setdefault(speed, []).extend((0, position, core, node["id"]) for core in range(cores))
+            if insertion:
+                # Cores of each group in node list order, to search for gaps
+                self._group_cores.setdefault(speed, []).extend((position, core, node["id"]) for core in range(cores))
+
+        self._core_indexes = {speed: _CoreIndex(cores) for speed, cores in self._group_cores.items()}
+        # Where each core is in the index of its group
+        self._core_slots = {
+            (node_id, core): (index, i)
+            for index in self._core_indexes.values()
+            for i, (_, core, node_id) in enumerate(index.cores)
+        }
+        self._speeds_fastest_first = sorted(self._group_cores, reverse=True)
+
+    def __len__(self):
+        return len(self.speeds)
+
+    def earliest_finish(self, ready_time, wcet):
+        """
+        Find the core that would finish a task first.
+
+        Args:
+            ready_time (int): Earliest time the task may start, e.g. when its last predecessor ends.
+            wcet (int): Worst case execution time of the task on a node of speed 1.
+
+        Raises:
+            ValueError: If the platform has no compute nodes.
+
+        Returns:
+            tuple: (node_id, core, start_time, end_time) of the best placement. Pass it to `assign` to take the core.
+        """
+        if self.insertion:
+            return self._earliest_finish_insertion(ready_time, wcet)
+        best = None
+        for speed, heap in self._groups.items():
+            available_time, position, core, node_id = heap[0]
+            start_time = max(ready_time, available_time)
+            end_time = start_time + execution_time(wcet, speed)
+            if best is None or (end_time, position) < best[0]:
+                best = ((end_time, position), (node_id, core, start_time, end_time))
+        if best is None:
+            raise ValueError("The platform has no compute nodes to schedule tasks on.")
+        return best[1]
+
+    def _earliest_finish_insertion(self, ready_time, wcet):
+        best = None
+        # The fastest groups have the smallest lower bound, so they are searched first to prune the others
+        for speed in self._speeds_fastest_first:
+            duration = execution_time(wcet, speed)
+            if best is not None and best[0][0] < ready_time + duration:
+                continue
+            index = self._core_indexes[speed]
+            start_time, i = index.earliest_start(ready_time, duration)
+            if i is None:
+                continue
+            position, core, node_id = index.cores[i]
+            end_time = start_time + duration
+            if best is None or (end_time, position, core) < best[0]:
+                best = ((end_time, position, core), (node_id, core, start_time, end_time))
+        if best is None:
+            raise ValueError("The platform has no compute nodes to schedule tasks on.")
+        return best[1]
+
+    def assign(self, placement):
+        """
+        Mark the core of a placement as busy until the placed task ends.
+
+        Args:
+            placement (tuple): The (node_id, core, start_time, end_time) returned by the latest call to `earliest_finish`.
+        """
+        node_id, core, start_time, end_time = placement
+        if self.insertion:
+            index, i = self._core_slots[node_id, core]
+            index.add(i, start_time, end_time)
+            return
+        heap = self._groups[self.speeds[node_id]]
+        # The placement was made from the top of its group, which has not changed since
+        _, position, _, _ = heap[0]
+        heapq.heapreplace(heap, (end_time, position, core, node_id))
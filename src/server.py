@@ -0,0 +1,129 @@
+"""
+This module runs the FastAPI app from the backend module as a multi-worker production server.
+
+All settings are taken from the config.py file, which reads them from environment variables. When gunicorn is
+installed, the app is imported once in the master process and the workers are forked from it, so the schemas,
+compiled validators and any other module-level state are shared between workers copy-on-write. gunicorn also
+provides graceful restarts: SIGHUP reloads the workers one by one, and workers are recycled after
+SERVER_MAX_REQUESTS requests. Without gunicorn (for example on Windows), uvicorn's own process manager is used,
+which starts each worker as a fresh process.
+
+Usage:
+    SERVER_HOST=0.0.0.0 SERVER_WORKERS=16 python3 src/server.py
+
+Functions:
+- run_gunicorn: Runs the app with gunicorn and uvicorn workers.
+- run_uvicorn: Runs the app with uvicorn's multi-process manager.
+- main: Runs the app with gunicorn if it is installed, otherwise with uvicorn.
+"""
+
+__version__ = "1.0.0"
+
+
+import gc
+import os
+import sys
+
+import config
+
+
+def _limit_concurrency():
+    # uvicorn expects None rather than 0 for no limit
+    return config.SERVER_LIMIT_CONCURRENCY or None
+
+
+try:
+    from uvicorn.workers import UvicornWorker
+except ImportError:
+    # uvicorn.workers needs gunicorn, run_uvicorn does not use it
+    UvicornWorker = None
+else:
+    class Worker(UvicornWorker):
+        """
+        gunicorn worker class running uvicorn with the event loop, HTTP implementation and concurrency limit from config.py.
+        """
+
+        CONFIG_KWARGS = {
+            "loop": config.SERVER_LOOP,
+            "http": config.SERVER_HTTP,
+            "limit_concurrency": _limit_concurrency(),
+        }
+
+
+def run_gunicorn():
+    """
+    Run the app with gunicorn, forking uvicorn workers from a master that has already imported it.
+    """
+    from gunicorn.app.base import BaseApplication
+
+    # Import the app, and with it the schemas and validators, before any worker is forked
+    from backend import app
+
+    def when_ready(server):
+        # Move everything imported so far out of the garbage collector's reach, so collections in the
+        # workers do not write to these objects and un-share their memory pages
+        gc.freeze()
+
+    class Application(BaseApplication):
+        def load_config(self):
+            settings = {
+                "bind": f"{config.SERVER_HOST}:{config.SERVER_PORT}",
+                "workers": config.SERVER_WORKERS,
+                "worker_class": "server.Worker",
+                "preload_app": True,
+                "backlog": config.SERVER_BACKLOG,
+                "keepalive": config.SERVER_KEEPALIVE,
+                "timeout": config.SERVER_TIMEOUT,
+                "graceful_timeout": config.SERVER_GRACEFUL_TIMEOUT,
+                "max_requests": config.SERVER_MAX_REQUESTS,
+                "max_requests_jitter": config.SERVER_MAX_REQUESTS_JITTER,
+                "when_ready": when_ready,
+            }
+            for key, value in settings.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return app
+
+    Application().run()
+
+
+def run_uvicorn():
+    """
+    Run the app with uvicorn's multi-process manager. Each worker imports the app itself.
+    """
+    import uvicorn
+
+    # uvicorn imports the app from a string in each worker, app_dir puts this directory on their path
+    uvicorn.run(
+        "backend:app",
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+        host=config.SERVER_HOST,
+        port=config.SERVER_PORT,
+        workers=config.SERVER_WORKERS,
+        loop=config.SERVER_LOOP,
+        http=config.SERVER_HTTP,
+        backlog=config.SERVER_BACKLOG,
+        timeout_keep_alive=config.SERVER_KEEPALIVE,
+        limit_concurrency=_limit_concurrency(),
+        limit_max_requests=config.SERVER_MAX_REQUESTS or None,
+        timeout_graceful_shutdown=config.SERVER_GRACEFUL_TIMEOUT,
+        log_level="info",
+    )
+
+
+def main():
+    """
+    Run the production server with gunicorn if it is installed, otherwise with uvicorn.
+    """
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        print("gunicorn is not installed, starting uvicorn workers without a preloaded app", file=sys.stderr)
+        run_uvicorn()
+    else:
+        run_gunicorn()
+
+
+if __name__ == "__main__":
+    main()
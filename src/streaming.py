@@ -0,0 +1,188 @@
+"""
+This module streams the results of a scheduling request to the client while they are computed.
+
+The schedules are computed in a thread, which emits events into a bounded buffer. The response reads the events
+from the buffer as the client receives them. When the buffer is full the thread waits, so a slow client slows
+down the computation instead of filling up memory, and when the client goes away the computation is stopped.
+The buffer is an asyncio queue, filled from the thread through the event loop, so the response waits for events
+on the event loop and does not hold a worker thread of the server for as long as the client reads.
+
+Events are encoded as Server-Sent Events (text/event-stream) or as newline-delimited JSON (application/x-ndjson):
+
+    event: chunk
+    data: {"key": "schedule4", "placed": 500, "total": 3000, "entries": [...]}
+
+    {"event": "chunk", "data": {"key": "schedule4", "placed": 500, "total": 3000, "entries": [...]}}
+
+Classes:
+- EventStream: Runs a producer in a thread and hands its events to the response through a bounded buffer.
+- ScheduleProgress: Progress callback for the scheduling algorithms, emitting the placed entries in chunks.
+- StreamClosed: Raised in the producer when the client has gone away.
+
+Functions:
+- format_event: Encodes an event in one of the STREAM_FORMATS.
+"""
+
+__version__ = "1.0.0"
+
+
+import asyncio
+import json
+import threading
+import time
+
+
+# Media type of each stream format
+STREAM_FORMATS = {"sse": "text/event-stream", "ndjson": "application/x-ndjson"}
+
+# Seconds between checks of the producer whether the client has gone away while the buffer is full
+_POLL_INTERVAL = 0.5
+
+
+class StreamClosed(Exception):
+    """Raised in the producer when the client has gone away, to stop computing results nobody reads."""
+
+
+def format_event(event, data, stream_format):
+    """
+    Encode an event.
+
+    Args:
+        event (str): The type of the event, e.g. 'chunk'.
+        data (dict): The data of the event.
+        stream_format (str): 'sse' for Server-Sent Events, 'ndjson' for newline-delimited JSON.
+
+    Returns:
+        bytes: The encoded event.
+    """
+    if stream_format == "sse":
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+    return (json.dumps({"event": event, "data": data}) + "\n").encode()
+
+
+class EventStream:
+    """
+    Run a producer in a thread and iterate over the events it emits, encoded, from an async response.
+
+    The producer is called with an emit(event, data) function. Events are encoded in the producer's thread, so
+    large schedules are not serialized on the event loop. Once the producer has finished, on_done is run on the
+    event loop, e.g. to release resources it needed, without waiting for the client to read the buffered events.
+
+    Attributes:
+        stream_format (str): One of STREAM_FORMATS.
+    """
+
+    _END = object()
+
+    def __init__(self, produce, stream_format, buffer_size, on_done=None):
+        """
+        Args:
+            produce (function): Called in a thread with an emit(event, data) function.
+            stream_format (str): One of STREAM_FORMATS.
+            buffer_size (int): Number of encoded events buffered before the producer waits.
+            on_done (function): Coroutine function run on the event loop once the producer has finished.
+        """
+        self.stream_format = stream_format
+        self._produce = produce
+        self._on_done = on_done
+        # Free places in the buffer, taken by the producer and given back by the consumer
+        self._space = threading.Semaphore(buffer_size)
+        self._events = None
+        self._closed = threading.Event()
+        self._loop = None
+
+    def emit(self, event, data):
+        """
+        Add an event to the buffer, waiting while it is full.
+
+        Raises:
+            StreamClosed: If the client has gone away.
+        """
+        self._put(format_event(event, data, self.stream_format))
+
+    def _put(self, item):
+        # Wait for a free place in the buffer, then hand the item to the event loop, which owns the queue
+        while not self._space.acquire(timeout=_POLL_INTERVAL):
+            if self._closed.is_set():
+                raise StreamClosed()
+        if self._closed.is_set():
+            raise StreamClosed()
+        try:
+            self._loop.call_soon_threadsafe(self._events.put_nowait, item)
+        except RuntimeError:
+            # The event loop has already been closed
+            raise StreamClosed()
+
+    def _run(self):
+        try:
+            self._produce(self.emit)
+        except StreamClosed:
+            return
+        except Exception as err:
+            print("Stream failed:", err)
+            try:
+                self.emit("error", {"detail": str(err)})
+            except StreamClosed:
+                return
+        finally:
+            if self._on_done is not None:
+                asyncio.run_coroutine_threadsafe(self._on_done(), self._loop)
+        try:
+            self._put(self._END)
+        except StreamClosed:
+            pass
+
+    async def __aiter__(self):
+        self._loop = asyncio.get_running_loop()
+        # Never holds more than the buffer size, as the producer only adds items for which it took a free place
+        self._events = asyncio.Queue()
+        thread = threading.Thread(target=self._run, daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = await self._events.get()
+                self._space.release()
+                if item is self._END:
+                    return
+                yield item
+        finally:
+            # Reached when the stream ends or the client goes away, the producer stops at its next event
+            self._closed.set()
+
+
+class ScheduleProgress:
+    """
+    Progress callback for a scheduling algorithm, emitting the entries it places in 'chunk' events.
+
+    A chunk is emitted once chunk_size entries have been placed, or once interval seconds have passed since the
+    last chunk, whichever comes first. Each chunk carries the number of tasks placed so far and the total.
+
+    Attributes:
+        key (str): The key of the schedule in the response, e.g. 'schedule4'.
+        total (int): The number of tasks of the application.
+        placed (int): The number of entries placed so far.
+    """
+
+    def __init__(self, emit, key, total, chunk_size, interval):
+        self.key = key
+        self.total = total
+        self.placed = 0
+        self._emit = emit
+        self._chunk_size = chunk_size
+        self._interval = interval
+        self._entries = []
+        self._last_flush = time.perf_counter()
+
+    def __call__(self, entry):
+        if entry is not None:
+            self._entries.append(entry)
+            self.placed += 1
+        if len(self._entries) >= self._chunk_size or (self._entries and time.perf_counter() - self._last_flush >= self._interval):
+            self.flush()
+
+    def flush(self):
+        """Emit the entries placed since the last chunk, if any."""
+        if self._entries:
+            self._emit("chunk", {"key": self.key, "placed": self.placed, "total": self.total, "entries": self._entries})
+            self._entries = []
+        self._last_flush = time.perf_counter()
@@ -0,0 +1,160 @@
+"""
+This module contains the lightweight directed graph used by the scheduling algorithms.
+
+The schedulers only need a handful of graph operations on the task dependency graph: adding tasks and
+messages, looking up predecessors and successors, checking for cycles, computing a topological order and
+splitting the graph into independent components.
+Importing networkx for these dominates the start-up time of the backend, so they are implemented here
+with plain dictionaries. networkx is only imported lazily by `TaskGraph.to_networkx` for optional analysis.
+
+Classes:
+- TaskGraph: Directed graph of tasks (nodes) and messages (edges).
+"""
+
+__version__ = "1.0.0"
+
+
+from collections import deque
+
+
+class TaskGraph:
+    """
+    Directed graph of tasks connected by messages.
+
+    Nodes and edges are kept in insertion order, so `topological_sort` returns the same order
+    as `networkx.topological_sort` on a `networkx.DiGraph` built the same way.
+
+    Attributes:
+        nodes (dict): Maps each task id to the dictionary of attributes it was added with.
+    """
+
+    def __init__(self):
+        self.nodes = {}
+        # Dictionaries are used as ordered sets so that parallel messages collapse into one edge
+        self._succ = {}
+        self._pred = {}
+
+    @classmethod
+    def from_application(cls, application_data):
+        """
+        Build the dependency graph of an application model.
+
+        Args:
+            application_data (dict): Application model with 'tasks' and optional 'messages'.
+
+        Returns:
+            TaskGraph: Graph with one node per task, carrying 'wcet' and 'deadline', and one edge per message.
+        """
+        graph = cls()
+        for task in application_data["tasks"]:
+            graph.add_node(task["id"], wcet=task["wcet"], deadline=task["deadline"])
+        for message in application_data.get("messages", []):
+            graph.add_edge(message["sender"], message["receiver"])
+        return graph
+
+    def add_node(self, node_id, **attrs):
+        """Add a node, or update the attributes of an existing one."""
+        if node_id not in self.nodes:
+            self.nodes[node_id] = {}
+            self._succ[node_id] = {}
+            self._pred[node_id] = {}
+        self.nodes[node_id].update(attrs)
+
+    def add_edge(self, sender, receiver):
+        """Add an edge from sender to receiver. Missing nodes are added without attributes."""
+        self.add_node(sender)
+        self.add_node(receiver)
+        self._succ[sender][receiver] = None
+        self._pred[receiver][sender] = None
+
+    def predecessors(self, node_id):
+        """Return an iterator over the nodes with an edge into node_id."""
+        return iter(self._pred[node_id])
+
+    def successors(self, node_id):
+        """Return an iterator over the nodes node_id has an edge to."""
+        return iter(self._succ[node_id])
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, node_id):
+        return node_id in self.nodes
+
+    def _kahn_order(self):
+        # Kahn's algorithm with a FIFO queue, visiting nodes in insertion order
+        in_degree = {node_id: len(preds) for node_id, preds in self._pred.items()}
+        queue = deque(node_id for node_id, degree in in_degree.items() if degree == 0)
+        order = []
+        while queue:
+            node_id = queue.popleft()
+            order.append(node_id)
+            for successor in self._succ[node_id]:
+                in_degree[successor] -= 1
+                if in_degree[successor] == 0:
+                    queue.append(successor)
+        return order
+
+    def is_directed_acyclic_graph(self):
+        """Return True if the graph has no cycles."""
+        return len(self._kahn_order()) == len(self.nodes)
+
+    def topological_sort(self):
+        """
+        Compute a topological order of the graph.
+
+        Raises:
+            ValueError: If the graph contains a cycle.
+
+        Returns:
+            list: Node ids such that every node comes after all of its predecessors.
+        """
+        order = self._kahn_order()
+        if len(order) != len(self.nodes):
+            raise ValueError("The task dependency graph has cycles, which is not supported.")
+        return order
+
+    def weakly_connected_components(self):
+        """
+        Split the graph into the groups of nodes connected by edges in either direction, in linear time.
+
+        Returns:
+            list: One list of node ids per component. Components are ordered by their first node in insertion order.
+        """
+        seen = set()
+        components = []
+        for node_id in self.nodes:
+            if node_id in seen:
+                continue
+            # Breadth first search over the edges in both directions
+            seen.add(node_id)
+            component = [node_id]
+            i = 0
+            while i < len(component):
+                current = component[i]
+                i += 1
+                for neighbour in (*self._succ[current], *self._pred[current]):
+                    if neighbour not in seen:
+                        seen.add(neighbour)
+                        component.append(neighbour)
+            components.append(component)
+        return components
+
+    def to_networkx(self):
+        """
+        Convert the graph to a `networkx.DiGraph` for analysis that is not needed while scheduling.
+
+        networkx is imported here rather than at module load so it is never paid for on the scheduling path.
+
+        Returns:
+            networkx.DiGraph: Graph with the same nodes, attributes and edges.
+        """
+        import networkx as nx
+
+        graph = nx.DiGraph()
+        for node_id, attrs in self.nodes.items():
+            graph.add_node(node_id, **attrs)
+        for sender, receivers in self._succ.items():
+            for receiver in receivers:
+                graph.add_edge(sender, receiver)
+        return graph
@@ -0,0 +1,190 @@
+"""
+This module contains the schedule verifier used by the tests and the /verify_schedule endpoint.
+
+A schedule is checked against its application model and, optionally, its platform model in time linear in the
+number of tasks, messages and schedule entries. The only exceptions are the node overlap check, which sorts the
+entries of each node, and the optional communication delay check, which computes shortest paths from each node
+that sends a message.
+
+Checks:
+- task: every entry refers to a task of the application, and each task is scheduled at most once.
+- duration: every task runs for its wcet, divided by the speed of its node when a platform is given.
+- deadline: every task ends by its deadline.
+- precedence: every task starts after the tasks sending it messages end, if they are scheduled.
+- overlap: no node runs more tasks at once than it has cores.
+- placement: every task runs on a compute node of the platform, when a platform is given.
+- communication: a task on another node than a predecessor also waits for the message to arrive, when requested.
+
+Functions:
+- verify_schedule: Returns the violations found in a schedule.
+- communication_delays: Computes the delay of messages between nodes over the platform's links.
+"""
+
+__version__ = "1.0.0"
+
+
+import heapq
+from collections import defaultdict
+
+from node_pool import execution_time
+
+
+def _violation(check, task_id, detail):
+    return {"check": check, "task_id": task_id, "detail": detail}
+
+
+def communication_delays(platform_data):
+    """
+    Build a function computing the time a message takes between two nodes.
+
+    Messages follow the path with the smallest total link delay. On each link they wait the link delay and
+    their size divided by the link bandwidth, so a message of size s between two nodes takes
+    sum(link_delay) + s * sum(1 / bandwidth) along the path. Both sums are computed once per sending node.
+
+    Args:
+        platform_data (dict): Platform model with 'nodes' and 'links'. Links can be used in both directions.
+
+    Returns:
+        function: delay(sender_node, receiver_node, size) returning the delay, or None if the nodes are not connected.
+    """
+    # Link end points may be given as strings or integers
+    adjacency = defaultdict(list)
+    for link in platform_data.get("links", []):
+        start, end = str(link["start_node"]), str(link["end_node"])
+        inverse_bandwidth = 1 / link["bandwidth"] if link["bandwidth"] else float("inf")
+        adjacency[start].append((end, link["link_delay"], inverse_bandwidth))
+        adjacency[end].append((start, link["link_delay"], inverse_bandwidth))
+
+    paths = {}
+
+    def shortest_paths(source):
+        # Dijkstra on the link delay, also summing the inverse bandwidth along the chosen paths
+        distances = {source: (0, 0.0)}
+        queue = [(0, 0.0, source)]
+        while queue:
+            delay, inverse_bandwidth, node = heapq.heappop(queue)
+            if distances[node] < (delay, inverse_bandwidth):
+                continue
+            for neighbour, link_delay, link_inverse_bandwidth in adjacency[node]:
+                candidate = (delay + link_delay, inverse_bandwidth + link_inverse_bandwidth)
+                if neighbour not in distances or candidate < distances[neighbour]:
+                    distances[neighbour] = candidate
+                    heapq.heappush(queue, (*candidate, neighbour))
+        return distances
+
+    def delay(sender_node, receiver_node, size):
+        if sender_node == receiver_node:
+            return 0
+        source = str(sender_node)
+        if source not in paths:
+            paths[source] = shortest_paths(source)
+        path = paths[source].get(str(receiver_node))
+        if path is None:
+            return None
+        return path[0] + size * path[1]
+
+    return delay
+
+
+def verify_schedule(application_data, schedule, platform_data=None, check_communication=False):
+    """
+    Check a schedule against its application and platform models.
+
+    Tasks missing from the schedule are not violations, as the scheduling algorithms drop tasks that cannot meet
+    their deadlines. Single-node schedules should be verified without a platform, since they do not place
+    tasks on the platform's nodes.
+
+    Args:
+        application_data (dict): Application model with 'tasks' and 'messages'.
+        schedule (list): Schedule entries with 'task_id', 'node_id', 'start_time' and 'end_time'.
+        platform_data (dict): Optional platform model. When given, node speeds, cores and types are checked.
+        check_communication (bool): Also require messages between tasks on different nodes to have arrived.
+
+    Raises:
+        ValueError: If check_communication is requested without a platform.
+
+    Returns:
+        list: The violations found, each a dictionary with the 'check' that failed, the 'task_id' and a 'detail' message.
+              An empty list means the schedule is valid.
+    """
+    if check_communication and platform_data is None:
+        raise ValueError("Checking communication delays needs a platform model.")
+
+    violations = []
+    tasks = {task["id"]: task for task in application_data["tasks"]}
+    nodes = {node["id"]: node for node in platform_data["nodes"]} if platform_data is not None else None
+
+    entries = {}
+    entries_by_node = defaultdict(list)
+    for entry in schedule:
+        task_id = entry["task_id"]
+        node_id = entry["node_id"]
+        start_time = entry["start_time"]
+        end_time = entry["end_time"]
+
+        task = tasks.get(task_id)
+        if task is None:
+            violations.append(_violation("task", task_id, f"Task {task_id} is not in the application model"))
+            continue
+        if task_id in entries:
+            violations.append(_violation("task", task_id, f"Task {task_id} is scheduled more than once"))
+            continue
+        entries[task_id] = entry
+
+        speed = 1
+        if nodes is not None:
+            node = nodes.get(node_id)
+            if node is None or node["type"] != "compute":
+                violations.append(_violation("placement", task_id, f"Task {task_id} runs on node {node_id}, which is not a compute node"))
+            else:
+                speed = node.get("speed", 1)
+        duration = execution_time(task["wcet"], speed)
+        if end_time - start_time != duration:
+            violations.append(_violation("duration", task_id, f"Task {task_id} runs for {end_time - start_time} instead of {duration}"))
+
+        if end_time > task["deadline"]:
+            violations.append(_violation("deadline", task_id, f"Task {task_id} ends at {end_time} after its deadline {task['deadline']}"))
+
+        entries_by_node[node_id].append((start_time, end_time, task_id))
+
+    delay = communication_delays(platform_data) if check_communication else None
+    for message in application_data["messages"]:
+        sender = entries.get(message["sender"])
+        receiver = entries.get(message["receiver"])
+        if sender is None or receiver is None:
+            continue
+        ready_time = sender["end_time"]
+        if delay is not None and sender["node_id"] != receiver["node_id"]:
+            message_delay = delay(sender["node_id"], receiver["node_id"], message["size"])
+            if message_delay is None:
+                violations.append(_violation(
+                    "communication", receiver["task_id"],
+                    f"Message {message['id']} cannot reach node {receiver['node_id']} from node {sender['node_id']}",
+                ))
+                continue
+            ready_time += message_delay
+            if receiver["start_time"] < ready_time:
+                violations.append(_violation(
+                    "communication", receiver["task_id"],
+                    f"Task {receiver['task_id']} starts at {receiver['start_time']} before message {message['id']} arrives at {ready_time}",
+                ))
+                continue
+        if receiver["start_time"] < sender["end_time"]:
+            violations.append(_violation(
+                "precedence", receiver["task_id"],
+                f"Task {receiver['task_id']} starts at {receiver['start_time']} before its predecessor {sender['task_id']} ends at {sender['end_time']}",
+            ))
+
+    for node_id, node_entries in entries_by_node.items():
+        cores = nodes[node_id].get("cores", 1) if nodes is not None and node_id in nodes else 1
+        # Sweep over the tasks by start time, keeping the end times of the tasks still running
+        running = []
+        for start_time, end_time, task_id in sorted(node_entries):
+            while running and running[0] <= start_time:
+                heapq.heappop(running)
+            if len(running) >= cores:
+                violations.append(_violation("overlap", task_id, f"Task {task_id} starts at {start_time} while node {node_id} is busy"))
+                continue
+            heapq.heappush(running, end_time)
+
+    return violations
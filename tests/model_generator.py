@@ -0,0 +1,58 @@
+"""
+This module generates synthetic application and platform models for the tests and the benchmarks in benchmarks/.
+
+The example models in tests/input_models only have a handful of tasks. Generated models have any number of
+tasks, organised as independent pipelines, so they also exercise the decomposition into components, and run
+on compute nodes of mixed speeds and core counts connected to one router.
+
+Functions:
+- generate_model: Generates a model in the input schema of /schedule_jobs.
+"""
+
+__version__ = "1.0.0"
+
+
+import random
+
+
+def generate_model(num_tasks, num_compute_nodes, messages_per_task=2, pipeline_length=None, extra_links=0, seed=0):
+    """
+    Generate a model of independent pipelines on compute nodes of mixed speeds behind one router.
+
+    Tasks are split into pipelines of consecutive ids. Each task receives messages from up to messages_per_task
+    earlier tasks of its pipeline, so with at least one message per task every pipeline is connected.
+
+    Args:
+        num_tasks (int): Number of tasks.
+        num_compute_nodes (int): Number of compute nodes, with ids from 1. Node 0 is the router.
+        messages_per_task (int): Largest number of messages each task receives. Default is 2.
+        pipeline_length (int): Number of tasks per pipeline. Default is a tenth of the tasks, and at least 2.
+        extra_links (int): Number of links between random compute nodes, besides one from each to the router.
+        seed (int): Seed of the random generator, the same arguments always give the same model.
+
+    Returns:
+        dict: The model, with 'application' and 'platform' data.
+    """
+    rng = random.Random(seed)
+    tasks = [
+        {"id": i, "wcet": rng.randint(1, 20), "mcet": 1, "deadline": rng.randint(20 * num_tasks, 40 * num_tasks)}
+        for i in range(num_tasks)
+    ]
+    messages = []
+    pipeline_length = pipeline_length or max(2, num_tasks // 10)
+    for receiver in range(num_tasks):
+        pipeline_start = receiver - receiver % pipeline_length
+        for sender in rng.sample(range(pipeline_start, receiver), min(messages_per_task, receiver - pipeline_start)):
+            messages.append({"id": len(messages), "sender": sender, "receiver": receiver, "size": rng.randint(1, 100)})
+    nodes = [{"id": 0, "type": "router"}] + [
+        {"id": i, "type": "compute", "speed": rng.choice([1, 1, 2, 4]), "cores": rng.choice([1, 2])}
+        for i in range(1, num_compute_nodes + 1)
+    ]
+    links = [
+        {"id": i, "start_node": 0, "end_node": i, "link_delay": 1, "bandwidth": 100, "type": "ethernet"}
+        for i in range(1, num_compute_nodes + 1)
+    ]
+    for _ in range(extra_links):
+        start, end = rng.sample(range(1, num_compute_nodes + 1), 2)
+        links.append({"id": len(links) + 1, "start_node": start, "end_node": end, "link_delay": 1, "bandwidth": 100, "type": "ethernet"})
+    return {"application": {"tasks": tasks, "messages": messages}, "platform": {"nodes": nodes, "links": links}}
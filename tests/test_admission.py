@@ -0,0 +1,154 @@
+import pytest
+import asyncio
+import json
+import os
+import sys
+
+# Adjust path to include the 'src' directory for importing the admission control
+script_dir = os.path.dirname(__file__)
+input_models_dir = os.path.join(script_dir, "input_models")
+sys.path.append(os.path.abspath(os.path.join(script_dir, "..", "src")))
+from admission import AdmissionController, CostModel, SizeClass, CostLimitExceeded, QueueFull, compute_cores, model_counts
+
+
+def controller(max_cost=0, queue_timeout=10):
+    # One millisecond per task, so the counts below are costs
+    return AdmissionController(
+        CostModel(0, 1, 0, 0, 0),
+        [SizeClass("large", float("inf"), 1, 1), SizeClass("small", 10, 2, 1)],
+        max_cost,
+        queue_timeout,
+    )
+
+
+def test_model_counts():
+    """Test that rows are counted per table and missing or malformed tables count as empty."""
+    application_model = {"tasks": [{}, {}, {}], "messages": [{}]}
+    platform_model = {"nodes": [{}, {}], "links": "not a list"}
+    assert model_counts(application_model, platform_model) == {
+        "tasks": 3, "messages": 1, "nodes": 2, "links": 0, "insertion_task_cores": 0
+    }
+    assert model_counts(None) == {"tasks": 0, "messages": 0, "nodes": 0, "links": 0, "insertion_task_cores": 0}
+
+
+def test_insertion_counts():
+    """Test that requests with insertion count their tasks times the compute cores, malformed nodes aside."""
+    application_model = {"tasks": [{}, {}, {}], "messages": []}
+    nodes = [
+        {"id": 0, "type": "router"},
+        {"id": 1, "type": "compute"},
+        {"id": 2, "type": "compute", "cores": 4},
+        {"id": 3, "type": "compute", "cores": "many"},
+        "not a node",
+    ]
+    assert compute_cores(nodes) == 6
+    assert compute_cores("not a list") == 0
+    assert model_counts(application_model, {"nodes": nodes}, insertion=True)["insertion_task_cores"] == 18
+    assert model_counts(application_model, {"nodes": nodes})["insertion_task_cores"] == 0
+
+
+def test_cost_model():
+    """Test that the cost is the base plus each table's coefficient times its rows."""
+    cost_model = CostModel(2, 0.5, 0.25, 1, 0)
+    assert cost_model.estimate({"tasks": 10, "messages": 4, "nodes": 3, "links": 100}) == 2 + 5 + 1 + 3
+    cost_model = CostModel(0, 1, 0, 0, 0, 0.5)
+    assert cost_model.estimate({"tasks": 10, "insertion_task_cores": 40}) == 10 + 20
+
+
+def test_classify():
+    """Test that requests fall into the cheapest class that holds them and the budget is enforced."""
+    admission = controller(max_cost=100)
+    assert admission.classify(10).name == "small"
+    assert admission.classify(11).name == "large"
+    with pytest.raises(CostLimitExceeded):
+        admission.classify(101)
+
+
+def test_admission_queues():
+    """Test that each class runs its own requests, queues up to its queue size and rejects the rest."""
+
+    async def scenario():
+        admission = controller(queue_timeout=0.05)
+        order = []
+
+        async def request(name, tasks, hold):
+            async with admission.admit({"tasks": tasks}):
+                order.append(name)
+                await hold.wait()
+
+        release = asyncio.Event()
+        running = asyncio.create_task(request("large 1", 1000, release))
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(request("large 2", 1000, release))
+        await asyncio.sleep(0)
+        # The large class runs one request and queues one, so a third is rejected at once
+        with pytest.raises(QueueFull):
+            async with admission.admit({"tasks": 1000}):
+                pass
+        # Small requests do not wait for the large ones
+        done = asyncio.Event()
+        done.set()
+        await request("small", 1, done)
+        release.set()
+        await asyncio.gather(running, queued)
+        assert order == ["large 1", "small", "large 2"]
+
+        # A request waiting longer than the queue timeout is rejected
+        release.clear()
+        running = asyncio.create_task(request("large 3", 1000, release))
+        await asyncio.sleep(0)
+        with pytest.raises(QueueFull):
+            async with admission.admit({"tasks": 1000}):
+                pass
+        release.set()
+        await running
+
+    asyncio.run(scenario())
+
+
+def test_schedule_jobs_admission(monkeypatch):
+    """Test that /schedule_jobs schedules admitted requests and rejects requests over the budget with a 413."""
+    testclient = pytest.importorskip("fastapi.testclient")
+    import backend
+
+    with open(os.path.join(input_models_dir, "example1.json")) as f:
+        model = json.load(f)
+    client = testclient.TestClient(backend.app)
+    response = client.post("/schedule_jobs", json=model)
+    assert response.status_code == 200
+    assert set(response.json()) == {"schedule1", "schedule2", "schedule3", "schedule4", "schedule5"}
+
+    monkeypatch.setattr(backend.admission, "max_cost", 1e-9)
+    monkeypatch.setattr(backend.admission.cost_model, "base", 1)
+    response = client.post("/schedule_jobs", json=model)
+    assert response.status_code == 413
+
+
+def test_request_counts_insertion(tmp_path, monkeypatch):
+    """Test that requests with insertion count their tasks times compute cores, for stored models too."""
+    pytest.importorskip("fastapi")
+    import backend
+    from model_store import ModelStore
+
+    with open(os.path.join(input_models_dir, "example1.json")) as f:
+        model = json.load(f)
+    cores = compute_cores(model["platform"]["nodes"])
+    monkeypatch.setattr(backend, "model_store", ModelStore(str(tmp_path), 1 << 30))
+    model_id = backend.model_store.put(model)
+    for request in (model, {"model_id": model_id}):
+        counts = backend.request_counts(dict(request, insertion=True))
+        assert counts["insertion_task_cores"] == len(model["application"]["tasks"]) * cores > 0
+        assert backend.request_counts(request)["insertion_task_cores"] == 0
+
+
+def test_request_size_limit():
+    """Test that bodies declared larger than the limit get a 413 and a malformed Content-Length gets a 400."""
+    testclient = pytest.importorskip("fastapi.testclient")
+    import backend
+
+    client = testclient.TestClient(backend.app)
+    headers = {"Content-Type": "application/json"}
+    response = client.post("/schedule_jobs", content=b"{}", headers=dict(headers, **{"Content-Length": "abc"}))
+    assert response.status_code == 400
+    response = client.post("/schedule_jobs", content=b"{}", headers=dict(headers, **{"Content-Length": str(backend.SERVER_MAX_REQUEST_SIZE + 1)}))
+    assert response.status_code == 413
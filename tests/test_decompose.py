@@ -0,0 +1,134 @@
+import pytest
+import os
+import random
+import sys
+
+# Adjust path to include the 'src' directory for importing the decomposition
+script_dir = os.path.dirname(__file__)
+sys.path.append(os.path.abspath(os.path.join(script_dir, "..", "src")))
+from algorithms import ldf_single_node, edf_single_node, edf_multinode, ll_multinode, ldf_multinode
+from decompose import split_application, partition, merge_schedules, schedule_components
+from model_generator import generate_model
+from task_graph import TaskGraph
+from verifier import verify_schedule
+
+
+def pipelines_model(num_pipelines, length, seed=0):
+    """Generate independent pipelines of tasks, with the tasks of the pipelines interleaved in the model."""
+    model = generate_model(num_pipelines * length, 2, messages_per_task=1, pipeline_length=length, seed=seed)
+    # Interleave the pipelines so that components do not follow the task order
+    random.Random(seed).shuffle(model["application"]["tasks"])
+    return model["application"], model["platform"]
+
+
+def test_weakly_connected_components():
+    """Test that edges join components in either direction and isolated nodes form their own component."""
+    task_graph = TaskGraph()
+    for node_id in range(6):
+        task_graph.add_node(node_id)
+    task_graph.add_edge(0, 2)
+    task_graph.add_edge(3, 2)
+    task_graph.add_edge(4, 5)
+    assert task_graph.weakly_connected_components() == [[0, 2, 3], [1], [4, 5]]
+
+
+def test_split_application():
+    """Test that every task and message ends up in exactly one component, in its original order."""
+    application_model, _ = pipelines_model(4, 5)
+    components = split_application(application_model)
+    assert len(components) == 4
+    for component in components:
+        task_ids = {task["id"] for task in component["tasks"]}
+        assert len({task_id // 5 for task_id in task_ids}) == 1
+        assert all(message["sender"] in task_ids for message in component["messages"])
+    assert sorted(t["id"] for c in components for t in c["tasks"]) == sorted(t["id"] for t in application_model["tasks"])
+    assert sum(len(c["messages"]) for c in components) == len(application_model["messages"])
+
+
+def test_single_component_is_scheduled_directly():
+    """Test that a connected model gives exactly the result of the algorithm itself."""
+    application_model, platform_model = pipelines_model(1, 20)
+    assert schedule_components(ldf_single_node, application_model, parallel=True) == ldf_single_node(application_model)
+    assert schedule_components(ldf_multinode, application_model, platform_model, parallel=True) == ldf_multinode(application_model, platform_model)
+
+
+def test_sequential_is_scheduled_directly():
+    """Test that a model that is not scheduled in parallel is not decomposed, so its result does not change."""
+    application_model, platform_model = pipelines_model(6, 8)
+    assert schedule_components(edf_single_node, application_model, parallel=False) == edf_single_node(application_model)
+    assert schedule_components(edf_multinode, application_model, platform_model, parallel=False) == edf_multinode(application_model, platform_model)
+
+
+@pytest.mark.parametrize("insertion", [False, True])
+def test_merged_schedules_are_valid(insertion):
+    """Test that merged schedules of all algorithms pass the verifier and keep every task."""
+    application_model, platform_model = pipelines_model(6, 8)
+    for algo in [ldf_single_node, edf_single_node]:
+        result = schedule_components(algo, application_model, parallel=True)
+        assert verify_schedule(application_model, result["schedule"]) == [], result["name"]
+        assert len(result["schedule"]) == len(application_model["tasks"])
+    for algo in [edf_multinode, ldf_multinode, ll_multinode]:
+        result = schedule_components(algo, application_model, platform_model, parallel=True, insertion=insertion)
+        assert verify_schedule(application_model, result["schedule"], platform_model) == [], result["name"]
+        assert len(result["schedule"]) == len(application_model["tasks"])
+
+
+def test_partition():
+    """Test that components and cores are shared out between groups, with more capacity for more work."""
+    application_model, platform_model = pipelines_model(6, 8)
+    # One pipeline with most of the work
+    for task in application_model["tasks"]:
+        if task["id"] < 8:
+            task["wcet"] *= 10
+    platform_model["nodes"] = [{"id": 0, "type": "router"}] + [
+        {"id": i, "type": "compute", "speed": 1, "cores": 2} for i in range(1, 4)
+    ]
+    groups = partition(application_model, platform_model, 2)
+    assert len(groups) == 2
+    assert sorted(t["id"] for application, _ in groups for t in application["tasks"]) == sorted(t["id"] for t in application_model["tasks"])
+    for application, _ in groups:
+        # Components are never split between groups
+        assert len(split_application(application)) * 8 == len(application["tasks"])
+    heavy, light = sorted(groups, key=lambda group: -sum(t["wcet"] for t in group[0]["tasks"]))
+    assert sum(node["cores"] for node in heavy[1]["nodes"]) > sum(node["cores"] for node in light[1]["nodes"])
+    assert sum(node["cores"] for _, platform in groups for node in platform["nodes"]) == 6
+    assert partition(application_model, {"nodes": [{"id": 1, "type": "compute"}], "links": []}) == [
+        (application_model, {"nodes": [{"id": 1, "type": "compute"}], "links": []})
+    ]
+
+
+def test_merge_keeps_the_placement_of_each_group():
+    """Test that the merged schedule is the schedules of the groups put together, without placing tasks again."""
+    application_model, platform_model = pipelines_model(6, 8)
+    result = schedule_components(ldf_multinode, application_model, platform_model, parallel=True)
+    expected = [entry for application, platform in partition(application_model, platform_model, 2) for entry in ldf_multinode(application, platform)["schedule"]]
+    assert result["schedule"] == expected
+    assert result["name"] == "LDF Multi Node"
+    assert merge_schedules([{"name": "A", "schedule": [1]}, {"name": "A", "schedule": [2, 3]}]) == {"name": "A", "schedule": [1, 2, 3]}
+
+
+def test_single_node_algorithms_are_not_decomposed():
+    """Test that the single-node algorithms always schedule the whole model, as they have one core to share."""
+    application_model = {
+        "tasks": [{"id": 0, "wcet": 10, "mcet": 5, "deadline": 1000}, {"id": 1, "wcet": 10, "mcet": 5, "deadline": 10}],
+        "messages": [],
+    }
+    assert schedule_components(edf_single_node, application_model, parallel=True) == edf_single_node(application_model)
+
+
+def test_parallel_least_laxity_still_fails_on_missed_deadlines():
+    """Test that a missed deadline fails least laxity scheduling in parallel as it does when scheduling directly."""
+    application_model, platform_model = pipelines_model(4, 4)
+    application_model["tasks"][0]["deadline"] = 0
+    with pytest.raises(Exception, match="cannot meet its deadline"):
+        ll_multinode(application_model, platform_model)
+    with pytest.raises(Exception, match="cannot meet its deadline"):
+        schedule_components(ll_multinode, application_model, platform_model, parallel=True)
+
+
+def test_parallel_progress_reports_every_entry():
+    """Test that every entry of a schedule scheduled in parallel is reported to the progress callback."""
+    application_model, platform_model = pipelines_model(6, 8)
+    entries = []
+    result = schedule_components(edf_multinode, application_model, platform_model, parallel=True, progress=entries.append)
+    assert sorted(entries, key=lambda entry: entry["task_id"]) == sorted(result["schedule"], key=lambda entry: entry["task_id"])
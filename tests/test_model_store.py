@@ -0,0 +1,96 @@
+import pytest
+import os
+import json
+import sys
+
+# Adjust path to include the 'src' directory for importing the model store
+script_dir = os.path.dirname(__file__)
+input_models_dir = os.path.join(script_dir, "input_models")
+sys.path.append(os.path.abspath(os.path.join(script_dir, "..", "src")))
+from algorithms import ldf_single_node, edf_single_node, edf_multinode, ll_multinode, ldf_multinode
+from model_store import ModelStore
+
+
+def load_model(filename):
+    with open(os.path.join(input_models_dir, filename)) as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("filename", os.listdir(input_models_dir))
+def test_stored_model_round_trip(filename, tmp_path):
+    """Test that a stored model reads back exactly as it was uploaded."""
+    model = load_model(filename)
+    store = ModelStore(str(tmp_path), 1 << 30)
+    application_data, platform_data = store.get(store.put(model)).model()
+    for table_name, table in {**application_data, **platform_data}.items():
+        part = "application" if table_name in application_data else "platform"
+        assert [dict(row) for row in table] == model[part][table_name]
+
+
+@pytest.mark.parametrize("filename", os.listdir(input_models_dir))
+def test_stored_model_schedules(filename, tmp_path):
+    """Test that the algorithms produce the same schedules from a stored model as from JSON."""
+    model = load_model(filename)
+    store = ModelStore(str(tmp_path), 1 << 30)
+    application_data, platform_data = store.get(store.put(model)).model()
+    for algo in [ldf_single_node, edf_single_node]:
+        assert algo(application_data) == algo(model["application"])
+    for algo in [edf_multinode, ldf_multinode, ll_multinode]:
+        assert algo(application_data, platform_data) == algo(model["application"], model["platform"])
+
+
+def test_stored_model_overrides(tmp_path):
+    """Test that overrides change single rows without changing the stored model."""
+    model = load_model("example1.json")
+    store = ModelStore(str(tmp_path), 1 << 30)
+    stored_model = store.get(store.put(model))
+    application_data, platform_data = stored_model.model(
+        {"tasks": [{"id": 2, "deadline": 1000}], "nodes": [{"id": 1, "speed": 2}]}
+    )
+    assert dict(application_data["tasks"][2]) == {"id": 2, "wcet": 20, "mcet": 10, "deadline": 1000}
+    assert dict(platform_data["nodes"][1]) == {"id": 1, "type": "compute", "speed": 2}
+    assert stored_model.tables["tasks"][2]["deadline"] == 300
+    with pytest.raises(KeyError):
+        stored_model.model({"tasks": [{"id": 42, "deadline": 1}]})
+
+
+def test_model_store_eviction(tmp_path):
+    """Test that the least recently used models are evicted once the store is too large."""
+    model = load_model("example1.json")
+    store = ModelStore(str(tmp_path), 1 << 30)
+    model_ids = []
+    for deadline in range(3):
+        model["application"]["tasks"][0]["deadline"] = 1000 + deadline
+        model_ids.append(store.put(model))
+    size = store.get(model_ids[0]).size
+    # Make the second model the least recently used
+    os.utime(os.path.join(str(tmp_path), model_ids[1] + ".model"), (0, 0))
+
+    store.max_bytes = 2 * size
+    store.evict()
+    with pytest.raises(KeyError):
+        store.get(model_ids[1])
+    assert store.get(model_ids[0]).size == size
+    assert store.get(model_ids[2]).size == size
+
+
+def test_stored_model_large_integers(tmp_path):
+    """Test that integers beyond 64 bits, which the input schema allows, are stored exactly."""
+    testclient = pytest.importorskip("fastapi.testclient")
+    import backend
+
+    model = load_model("example1.json")
+    model["application"]["tasks"][0]["deadline"] = 2**63
+    model["application"]["tasks"][1]["wcet"] = 2.5
+    model["application"]["tasks"][1]["mcet"] = -(2**70)
+    store = ModelStore(str(tmp_path), 1 << 30)
+    application_data, _ = store.get(store.put(model)).model()
+    assert [dict(row) for row in application_data["tasks"]] == model["application"]["tasks"]
+
+    # The input schema only allows integer times
+    model = load_model("example1.json")
+    model["application"]["tasks"][0]["deadline"] = 2**63
+    client = testclient.TestClient(backend.app)
+    response = client.post("/models", json=model)
+    assert response.status_code == 200
+    assert client.post("/schedule_jobs", json={"model_id": response.json()["model_id"]}).json() == client.post("/schedule_jobs", json=model).json()
@@ -1,6 +1,7 @@
 import pytest
 import os
 import json
+import random
 import sys
 
 # Adjust path to include the 'src' directory for importing algorithms
@@ -8,73 +9,179 @@ script_dir = os.path.dirname(__file__)
 input_models_dir = os.path.join(script_dir, "input_models")
 sys.path.append(os.path.abspath(os.path.join(script_dir, "..", "src")))
 from algorithms import ldf_single_node, edf_single_node, edf_multinode, ll_multinode, ldf_multinode, ldf_single_node
+from model_generator import generate_model
+from node_pool import NodePool, IntervalIndex
+from task_graph import TaskGraph
+from verifier import verify_schedule
+
+
+# Sizes (tasks, compute nodes) of generated models tested along with the example models
+generated_models = {"generated_small": (40, 3), "generated_large": (3000, 24)}
+model_names = sorted(os.listdir(input_models_dir)) + list(generated_models)
+
+
+def load_model(name):
+    if name in generated_models:
+        return generate_model(*generated_models[name])
+    with open(os.path.join(input_models_dir, name)) as f:
+        return json.load(f)
 
 
 # Utility function to load models and run scheduling algorithm
-def load_and_schedule(filename):
-    model_path = os.path.join(input_models_dir, filename)
-    with open(model_path) as f:
-        model_data = json.load(f)
+def load_and_schedule(name):
+    model_data = load_model(name)
 
     application_model = model_data["application"]
     platform_model = model_data["platform"]
     results = []
-   
+
+    # Single node schedules do not place tasks on the platform, so they are verified without it
     for algo in [ldf_single_node, edf_single_node]:
         result = algo(application_model)
-        results.append((result, application_model))
-    
+        results.append((result, application_model, None))
+
     for algo in [edf_multinode, ldf_multinode, ll_multinode]:
-        result = algo(application_model, platform_model)
-        results.append((result, application_model))
- 
+        for insertion in [False, True]:
+            result = algo(application_model, platform_model, insertion)
+            results.append((result, application_model, platform_model))
+
     return results
 
 
-@pytest.mark.parametrize("filename", os.listdir(input_models_dir))
-def test_task_duration(filename):
+def check_schedules(name, check):
+    for result, app_model, platform_model in load_and_schedule(name):
+        violations = verify_schedule(app_model, result["schedule"], platform_model)
+        failed = [violation["detail"] for violation in violations if violation["check"] == check]
+        assert not failed, f'{result["name"]}: {failed[:5]}'
+
+
+@pytest.mark.parametrize("name", model_names)
+def test_task_duration(name):
     """Test that each task completes within its estimated duration."""
-    for result, app_model in load_and_schedule(filename):
-        for task in result["schedule"]:
-            start_time = task["start_time"]
-            end_time = task["end_time"]
-            task_id = task["task_id"]
-            wcet = next(
-                (t["wcet"] for t in app_model["tasks"] if t["id"] == task_id), None
-            )
-            assert end_time == start_time + wcet, f'Incorrect task duration calculation in {result["name"]}'
+    check_schedules(name, "duration")
 
 
-@pytest.mark.parametrize("filename", os.listdir(input_models_dir))
-def test_task_deadline(filename):
+@pytest.mark.parametrize("name", model_names)
+def test_task_deadline(name):
     """Test that each task respects its deadline."""
-    for result, app_model in load_and_schedule(filename):
-        for task in result["schedule"]:
-            end_time = task["end_time"]
-            task_id = task["task_id"]
-            deadline = next(
-                (t["deadline"] for t in app_model["tasks"] if t["id"] == task_id), None
-            )
-            assert end_time <= deadline, f'Task exceeds deadline in {result["name"]}'
+    check_schedules(name, "deadline")
 
 
-@pytest.mark.parametrize("filename", os.listdir(input_models_dir))
-def test_task_dependencies(filename):
+@pytest.mark.parametrize("name", model_names)
+def test_task_dependencies(name):
     """Test that each task respects the completion times of its predecessors."""
-    for result, app_model in load_and_schedule(filename):
-        for task in result["schedule"]:
-            start_time = task["start_time"]
-            task_id = task["task_id"]
-            predecessors = [
-                msg["sender"]
-                for msg in app_model["messages"]
-                if msg["receiver"] == task_id
-            ]
-            predecessors_end_times = [
-                t["end_time"]
-                for t in result["schedule"]
-                if t["task_id"] in predecessors
-            ]
-            assert start_time >= max(
-                predecessors_end_times, default=0
-            ), f'Task starts before predecessor ends in {result["name"]}'
+    check_schedules(name, "precedence")
+
+
+@pytest.mark.parametrize("name", model_names)
+def test_node_overlap(name):
+    """Test that no node runs more tasks at once than it has cores."""
+    check_schedules(name, "overlap")
+
+
+@pytest.mark.parametrize("name", model_names)
+def test_task_placement(name):
+    """Test that each task is scheduled once, and multi-node schedules only use compute nodes."""
+    check_schedules(name, "task")
+    check_schedules(name, "placement")
+
+
+@pytest.mark.parametrize("filename", os.listdir(input_models_dir))
+def test_task_graph_matches_networkx(filename):
+    """Test that the built-in task graph orders tasks exactly like networkx."""
+    nx = pytest.importorskip("networkx")
+    with open(os.path.join(input_models_dir, filename)) as f:
+        application_model = json.load(f)["application"]
+    task_graph = TaskGraph.from_application(application_model)
+    assert task_graph.topological_sort() == list(nx.topological_sort(task_graph.to_networkx()))
+
+
+def test_task_graph_rejects_cycles():
+    """Test that a cyclic dependency graph is detected."""
+    task_graph = TaskGraph()
+    task_graph.add_edge(0, 1)
+    task_graph.add_edge(1, 2)
+    task_graph.add_edge(2, 0)
+    assert not task_graph.is_directed_acyclic_graph()
+    with pytest.raises(ValueError):
+        task_graph.topological_sort()
+
+
+def test_heterogeneous_nodes():
+    """Test that the multi-node algorithms use node speeds and cores and only place tasks on compute nodes."""
+    application_model = {
+        "tasks": [{"id": i, "wcet": 10, "mcet": 5, "deadline": 100} for i in range(4)],
+        "messages": [],
+    }
+    platform_model = {
+        "nodes": [
+            {"id": 0, "type": "router"},
+            {"id": 1, "type": "compute"},
+            {"id": 2, "type": "compute", "speed": 4, "cores": 2},
+        ],
+        "links": [],
+    }
+    for algo in [edf_multinode, ldf_multinode, ll_multinode]:
+        result = algo(application_model, platform_model)
+        placed = sorted((t["node_id"], t["start_time"], t["end_time"]) for t in result["schedule"])
+        # The fast node runs two tasks at a time in ceil(10 / 4) = 3, so all four finish by 6
+        assert placed == [(2, 0, 3), (2, 0, 3), (2, 3, 6), (2, 3, 6)], result["name"]
+
+
+def test_node_pool_earliest_finish():
+    """Test that a busy fast node is preferred over an idle slow node only when it finishes sooner."""
+    node_pool = NodePool([{"id": 1, "type": "compute"}, {"id": 2, "type": "compute", "speed": 2}])
+    node_pool.assign((2, 0, 0, 8))
+    # Slow node finishes at 10, fast node at 8 + 5 = 13
+    assert node_pool.earliest_finish(0, 10) == (1, 0, 0, 10)
+    # Both finish at 10, so the tie goes to the node listed first
+    assert node_pool.earliest_finish(6, 4)[0] == 1
+    # Slow node finishes at 28 + 20 = 48, fast node at 28 + 10 = 38
+    assert node_pool.earliest_finish(28, 20) == (2, 0, 28, 38)
+
+
+def test_interval_index():
+    """Test that the interval index finds the earliest gap a task fits in and merges touching intervals."""
+    intervals = IntervalIndex()
+    intervals.add(0, 10)
+    intervals.add(20, 30)
+    assert intervals.earliest_start(0, 10) == 10
+    assert intervals.earliest_start(0, 11) == 30
+    assert intervals.earliest_start(12, 5) == 12
+    assert intervals.earliest_start(15, 6) == 30
+    assert intervals.earliest_start(35, 5) == 35
+    intervals.add(10, 20)
+    assert len(intervals) == 1 and intervals.end() == 30
+
+
+def test_node_pool_insertion_matches_scanning_every_core():
+    """Test that the indexes of the node pool pick the same core and gap as checking every time on every core."""
+    rng = random.Random(0)
+    nodes = [{"id": i, "type": "compute", "speed": rng.choice([1, 2]), "cores": rng.choice([1, 2])} for i in range(6)]
+    node_pool = NodePool(nodes, insertion=True)
+    busy = {(node["id"], core): [] for node in nodes for core in range(node["cores"])}
+    for _ in range(500):
+        ready_time, wcet = rng.randint(0, 200), rng.randint(1, 15)
+        expected = None
+        for position, node in enumerate(nodes):
+            duration = -(-wcet // node["speed"])
+            for core in range(node["cores"]):
+                # The earliest time from the ready time at which no busy interval overlaps the task
+                start_time = ready_time
+                while any(s < start_time + duration and start_time < e for s, e in busy[node["id"], core]):
+                    start_time += 1
+                candidate = ((start_time + duration, position, core), (node["id"], core, start_time, start_time + duration))
+                expected = min(expected or candidate, candidate)
+        placement = node_pool.earliest_finish(ready_time, wcet)
+        assert placement == expected[1]
+        node_pool.assign(placement)
+        busy[placement[0], placement[1]].append(placement[2:])
+
+
+def test_node_pool_insertion():
+    """Test that with insertion a task fills an idle gap instead of waiting for the end of the node's timeline."""
+    for insertion, expected in [(False, (1, 0, 30, 35)), (True, (1, 0, 10, 15))]:
+        node_pool = NodePool([{"id": 1, "type": "compute"}], insertion=insertion)
+        node_pool.assign((1, 0, 0, 10))
+        node_pool.assign(node_pool.earliest_finish(20, 10))
+        assert node_pool.earliest_finish(5, 5) == expected
@@ -0,0 +1,177 @@
+import pytest
+import asyncio
+import json
+import os
+import sys
+import threading
+
+# Adjust path to include the 'src' directory for importing the streaming
+script_dir = os.path.dirname(__file__)
+input_models_dir = os.path.join(script_dir, "input_models")
+sys.path.append(os.path.abspath(os.path.join(script_dir, "..", "src")))
+from algorithms import ldf_multinode
+from streaming import EventStream, ScheduleProgress, format_event
+
+
+def test_format_event():
+    """Test that events are encoded as Server-Sent Events and as newline-delimited JSON."""
+    assert format_event("chunk", {"placed": 1}, "sse") == b'event: chunk\ndata: {"placed": 1}\n\n'
+    assert format_event("chunk", {"placed": 1}, "ndjson") == b'{"event": "chunk", "data": {"placed": 1}}\n'
+
+
+def test_schedule_progress_chunks():
+    """Test that the progress callback emits every entry once, in chunks, with the number of tasks placed."""
+    with open(os.path.join(input_models_dir, "example1.json")) as f:
+        model = json.load(f)
+    events = []
+    progress = ScheduleProgress(lambda event, data: events.append(dict(data)), "schedule4", 4, 3, float("inf"))
+    result = ldf_multinode(model["application"], model["platform"], progress=progress)
+    progress.flush()
+    assert [(data["placed"], len(data["entries"])) for data in events] == [(3, 3), (4, 1)]
+    assert [entry for data in events for entry in data["entries"]] == result["schedule"]
+
+
+def test_event_stream_stops_producer():
+    """Test that the buffer holds back the producer and that it stops once the consumer goes away."""
+    stopped = threading.Event()
+
+    def produce(emit):
+        try:
+            for i in range(1000):
+                emit("chunk", {"i": i})
+        finally:
+            stopped.set()
+
+    async def consume():
+        stream = EventStream(produce, "ndjson", 2)
+        received = []
+        async for event in stream:
+            received.append(json.loads(event)["data"]["i"])
+            if len(received) == 3:
+                break
+        return received
+
+    assert asyncio.run(consume()) == [0, 1, 2]
+    assert stopped.wait(5)
+
+
+def test_event_stream_runs_on_done_before_the_buffer_is_read():
+    """Test that on_done runs once the producer has finished, while its events are still buffered."""
+    def produce(emit):
+        for i in range(3):
+            emit("chunk", {"i": i})
+
+    async def consume():
+        done = asyncio.Event()
+
+        async def on_done():
+            done.set()
+
+        received = []
+        async for event in EventStream(produce, "ndjson", 4, on_done):
+            received.append(json.loads(event)["data"]["i"])
+            if len(received) == 1:
+                # The other events are still in the buffer
+                await asyncio.wait_for(done.wait(), 5)
+        return received
+
+    assert asyncio.run(consume()) == [0, 1, 2]
+
+
+def test_waiting_streams_leave_the_threadpool_free():
+    """Test that streams waiting for events do not hold the worker threads the requests are run in."""
+    to_thread = pytest.importorskip("anyio.to_thread")
+    release = threading.Event()
+
+    def produce(emit):
+        release.wait(5)
+        emit("chunk", {})
+
+    async def scenario():
+        streams = [EventStream(produce, "ndjson", 1) for _ in range(10)]
+        readers = [asyncio.create_task(stream.__aiter__().__anext__()) for stream in streams]
+        await asyncio.sleep(0.1)
+        try:
+            return to_thread.current_default_thread_limiter().borrowed_tokens
+        finally:
+            release.set()
+            await asyncio.gather(*readers)
+
+    assert asyncio.run(scenario()) == 0
+
+
+@pytest.mark.parametrize("stream_format", ["sse", "ndjson"])
+def test_schedule_jobs_stream(stream_format):
+    """Test that the stream carries every schedule of /schedule_jobs, with their entries in chunks before them."""
+    testclient = pytest.importorskip("fastapi.testclient")
+    import backend
+
+    with open(os.path.join(input_models_dir, "example1.json")) as f:
+        model = json.load(f)
+    client = testclient.TestClient(backend.app)
+    expected = client.post("/schedule_jobs", json=model).json()
+    response = client.post(f"/schedule_jobs/stream?format={stream_format}", json=model)
+    assert response.status_code == 200
+
+    if stream_format == "sse":
+        events = []
+        for block in response.text.split("\n\n")[:-1]:
+            event_line, data_line = block.split("\n")
+            events.append((event_line[len("event: "):], json.loads(data_line[len("data: "):])))
+    else:
+        events = [(line["event"], line["data"]) for line in map(json.loads, response.text.splitlines())]
+
+    assert events[0] == ("start", {"schedules": list(expected), "total": len(model["application"]["tasks"])})
+    assert events[-1] == ("end", {})
+    chunks = {}
+    results = {}
+    for event, data in events[1:-1]:
+        if event == "chunk":
+            chunks.setdefault(data["key"], []).extend(data["entries"])
+        else:
+            assert event == "schedule"
+            # The entries were sent in chunks, so only the rest of the result follows them
+            assert "schedule" not in data["result"]
+            results[data["key"]] = dict(data["result"], schedule=chunks.get(data["key"], []))
+    assert results == expected
+
+
+def test_schedule_jobs_stream_without_progress():
+    """Test that without progress each schedule event carries the complete result."""
+    testclient = pytest.importorskip("fastapi.testclient")
+    import backend
+
+    with open(os.path.join(input_models_dir, "example1.json")) as f:
+        model = json.load(f)
+    client = testclient.TestClient(backend.app)
+    expected = client.post("/schedule_jobs", json=model).json()
+    response = client.post("/schedule_jobs/stream?format=ndjson&progress=false", json=model)
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["event"] for event in events] == ["start"] + ["schedule"] * len(expected) + ["end"]
+    assert {event["data"]["key"]: event["data"]["result"] for event in events[1:-1]} == expected
+
+
+def test_schedule_jobs_stream_rejects_before_streaming():
+    """Test that invalid requests get an error status instead of a stream."""
+    testclient = pytest.importorskip("fastapi.testclient")
+    import backend
+
+    client = testclient.TestClient(backend.app)
+    assert client.post("/schedule_jobs/stream?format=xml", json={}).status_code == 400
+    assert client.post("/schedule_jobs/stream", json={"application": {}}).status_code == 400
+
+
+def test_cyclic_model_is_rejected():
+    """Test that a model whose tasks depend on each other in a cycle is rejected instead of scheduled forever."""
+    testclient = pytest.importorskip("fastapi.testclient")
+    import backend
+
+    with open(os.path.join(input_models_dir, "example1.json")) as f:
+        model = json.load(f)
+    message = dict(model["application"]["messages"][0])
+    message["id"] = max(m["id"] for m in model["application"]["messages"]) + 1
+    message["sender"], message["receiver"] = message["receiver"], message["sender"]
+    model["application"]["messages"].append(message)
+    client = testclient.TestClient(backend.app)
+    assert client.post("/schedule_jobs", json=model).status_code == 400
+    assert client.post("/schedule_jobs/stream", json=model).status_code == 400
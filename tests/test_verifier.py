@@ -0,0 +1,84 @@
+import pytest
+import os
+import sys
+
+# Adjust path to include the 'src' directory for importing the verifier
+script_dir = os.path.dirname(__file__)
+sys.path.append(os.path.abspath(os.path.join(script_dir, "..", "src")))
+from verifier import verify_schedule, communication_delays
+
+
+application_model = {
+    "tasks": [
+        {"id": 0, "wcet": 10, "mcet": 5, "deadline": 100},
+        {"id": 1, "wcet": 10, "mcet": 5, "deadline": 100},
+        {"id": 2, "wcet": 10, "mcet": 5, "deadline": 30},
+    ],
+    "messages": [
+        {"id": 0, "sender": 0, "receiver": 1, "size": 50},
+        {"id": 1, "sender": 0, "receiver": 2, "size": 50},
+    ],
+}
+platform_model = {
+    "nodes": [
+        {"id": 0, "type": "router"},
+        {"id": 1, "type": "compute"},
+        {"id": 2, "type": "compute", "speed": 2, "cores": 2},
+    ],
+    "links": [
+        {"id": 0, "start_node": 1, "end_node": 0, "link_delay": 2, "bandwidth": 10, "type": "ethernet"},
+        {"id": 1, "start_node": "0", "end_node": "2", "link_delay": 3, "bandwidth": 25, "type": "ethernet"},
+    ],
+}
+
+
+def entry(task_id, node_id, start_time, end_time):
+    return {"task_id": task_id, "node_id": node_id, "start_time": start_time, "end_time": end_time, "deadline": 0}
+
+
+def checks(schedule, platform=platform_model, **kwargs):
+    return sorted((v["check"], v["task_id"]) for v in verify_schedule(application_model, schedule, platform, **kwargs))
+
+
+def test_valid_schedule():
+    """Test that a valid schedule on a heterogeneous platform has no violations."""
+    schedule = [entry(0, 1, 0, 10), entry(1, 2, 10, 15), entry(2, 2, 12, 17)]
+    assert checks(schedule) == []
+
+
+def test_each_check():
+    """Test that every kind of violation is reported for the task that causes it."""
+    assert checks([entry(0, 1, 0, 10), entry(0, 1, 10, 20), entry(7, 1, 0, 1)]) == [("task", 0), ("task", 7)]
+    assert checks([entry(0, 2, 0, 10)]) == [("duration", 0)]
+    assert checks([entry(2, 1, 25, 35)]) == [("deadline", 2)]
+    assert checks([entry(0, 1, 5, 15), entry(1, 2, 10, 15)]) == [("precedence", 1)]
+    assert checks([entry(0, 1, 0, 10), entry(1, 1, 10, 20), entry(2, 1, 15, 25)]) == [("overlap", 2)]
+    assert checks([entry(0, 0, 0, 10)]) == [("placement", 0)]
+
+
+def test_cores_allow_parallel_tasks():
+    """Test that a node runs as many tasks at once as it has cores, and no more."""
+    schedule = [entry(1, 2, 0, 5), entry(2, 2, 0, 5)]
+    assert checks(schedule) == []
+    # Task 0 also precedes both tasks, so they start too early as well
+    assert checks(schedule + [entry(0, 2, 1, 6)]) == [("overlap", 0), ("precedence", 1), ("precedence", 2)]
+
+
+def test_single_node_without_platform():
+    """Test that schedules verified without a platform use speed 1, one core and any node."""
+    schedule = [entry(0, 0, 0, 10), entry(1, 0, 10, 20), entry(2, 0, 20, 30)]
+    assert checks(schedule, platform=None) == []
+
+
+def test_communication_delays():
+    """Test that messages between nodes take the link delays plus their size over each link's bandwidth."""
+    delay = communication_delays(platform_model)
+    assert delay(1, 1, 50) == 0
+    assert delay(1, 2, 50) == pytest.approx(2 + 3 + 50 / 10 + 50 / 25)
+    assert delay(1, 3, 50) is None
+
+    # Task 1 may start right after task 0 on the same node, but on node 2 only after 12 more time units
+    schedule = [entry(0, 1, 0, 10), entry(1, 1, 10, 20), entry(2, 2, 15, 20)]
+    assert checks(schedule, check_communication=True) == [("communication", 2)]
+    schedule[2] = entry(2, 2, 22, 27)
+    assert checks(schedule, check_communication=True) == []